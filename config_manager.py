@@ -28,7 +28,27 @@ Copyright (c) 2026 育材堂. All rights reserved.
 # ============================================================
 import os
 import json
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Optional, Tuple
+
+# ============================================================
+# 第三方库导入（可选）
+# ============================================================
+# 优先使用orjson加速读写，未安装时回退到标准库json（均输出紧凑格式）
+try:
+    import orjson
+
+    def _loads(raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _loads(raw: bytes) -> Any:
+        return json.loads(raw)
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
 # ============================================================
 # 版本信息
@@ -51,15 +71,36 @@ DEFAULT_CONFIG: Dict[str, str] = {
     "phase_template": "",     # 相变点绘图Origin模板路径
 }
 
+# 配置目录是否已创建
+_dir_ready: bool = False
+
+# 配置缓存（按文件修改时间失效，避免重复读取和解析）
+_CACHE: Optional[Dict[str, Any]] = None
+_CACHE_MTIME: int = -1
+
+# 模板路径校验结果缓存：key -> (校验时间, 有效路径)
+TEMPLATE_CHECK_TTL: float = 5.0
+_TEMPLATE_VALID: Dict[str, Tuple[float, str]] = {}
+
 
 def ensure_config_dir() -> None:
     """
     确保配置目录存在
     
-    如果配置目录不存在，则创建它。
+    如果配置目录不存在，则创建它。目录创建成功后不再重复检查。
     """
-    if not os.path.exists(CONFIG_DIR):
-        os.makedirs(CONFIG_DIR)
+    global _dir_ready
+    if _dir_ready:
+        return
+    try:
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        _dir_ready = True
+    except OSError as e:
+        print(f"创建配置目录失败: {e}")
+
+
+# 模块导入时创建一次配置目录
+ensure_config_dir()
 
 
 def load_config() -> Dict[str, Any]:
@@ -67,34 +108,42 @@ def load_config() -> Dict[str, Any]:
     加载配置文件
     
     从配置文件中读取用户配置。如果配置文件不存在或读取失败，
-    返回默认配置。
+    返回默认配置。配置文件未修改时直接返回缓存内容。
     
     Returns:
         Dict[str, Any]: 配置字典，包含所有配置项
     """
-    ensure_config_dir()
+    global _CACHE, _CACHE_MTIME
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime_ns
+        if _CACHE is not None and mtime == _CACHE_MTIME:
+            return _CACHE.copy()
+        
+        with open(CONFIG_FILE, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return DEFAULT_CONFIG.copy()
+    except Exception as e:
+        print(f"加载配置文件失败: {e}")
+        return DEFAULT_CONFIG.copy()
     
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                # 合并默认配置（处理新增配置项）
-                for key in DEFAULT_CONFIG:
-                    if key not in config:
-                        config[key] = DEFAULT_CONFIG[key]
-                return config
-        except Exception as e:
-            print(f"加载配置文件失败: {e}")
-            return DEFAULT_CONFIG.copy()
+    try:
+        # 合并默认配置（处理新增配置项）
+        config = DEFAULT_CONFIG | _loads(raw)
+    except Exception as e:
+        print(f"加载配置文件失败: {e}")
+        return DEFAULT_CONFIG.copy()
     
-    return DEFAULT_CONFIG.copy()
+    _CACHE = config
+    _CACHE_MTIME = mtime
+    return config.copy()
 
 
 def save_config(config: Dict[str, Any]) -> bool:
     """
     保存配置文件
     
-    将配置字典保存到配置文件中。
+    将配置字典原子地保存到配置文件中，并同步更新配置缓存。
     
     Args:
         config: 要保存的配置字典
@@ -102,23 +151,48 @@ def save_config(config: Dict[str, Any]) -> bool:
     Returns:
         bool: 保存成功返回True，失败返回False
     """
+    global _CACHE, _CACHE_MTIME
     ensure_config_dir()
     
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        # 先写临时文件再替换，避免写入中断导致配置文件损坏
+        tmp_file = CONFIG_FILE + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(_dumps(config))
+        os.replace(tmp_file, CONFIG_FILE)
+        _CACHE = dict(config)
+        _CACHE_MTIME = os.stat(CONFIG_FILE).st_mtime_ns
         return True
     except Exception as e:
         print(f"保存配置文件失败: {e}")
         return False
 
 
+def _mutate(key: str, value: Any) -> bool:
+    """
+    修改单个配置项并保存
+    
+    读取（通常命中缓存）、修改、写回在一次调用中完成。
+    
+    Args:
+        key: 配置项键名
+        value: 要设置的值
+        
+    Returns:
+        bool: 保存成功返回True，失败返回False
+    """
+    _TEMPLATE_VALID.pop(key, None)
+    config = load_config()
+    config[key] = value
+    return save_config(config)
+
+
 def get_template(key: str) -> str:
     """
     获取指定模板路径
     
     从配置中获取指定类型的Origin模板路径。
-    如果模板文件不存在，返回空字符串。
+    如果模板文件不存在，返回空字符串。校验结果在TEMPLATE_CHECK_TTL秒内复用。
     
     Args:
         key: 模板键名，可选值：
@@ -129,14 +203,20 @@ def get_template(key: str) -> str:
     Returns:
         str: 模板文件路径，如果不存在或文件已删除则返回空字符串
     """
+    now = time.monotonic()
+    cached = _TEMPLATE_VALID.get(key)
+    if cached is not None and now - cached[0] < TEMPLATE_CHECK_TTL:
+        return cached[1]
+    
     config = load_config()
     template_path = config.get(key, "")
     
     # 验证文件是否存在
-    if template_path and os.path.exists(template_path):
-        return template_path
+    if not (template_path and os.path.exists(template_path)):
+        template_path = ""
     
-    return ""
+    _TEMPLATE_VALID[key] = (now, template_path)
+    return template_path
 
 
 def set_template(key: str, path: str) -> None:
@@ -152,9 +232,7 @@ def set_template(key: str, path: str) -> None:
             - 'phase_template': 相变点绘图模板
         path: 模板文件的完整路径
     """
-    config = load_config()
-    config[key] = path
-    save_config(config)
+    _mutate(key, path)
 
 
 def get_config_value(key: str, default: Any = None) -> Any:
@@ -187,6 +265,4 @@ def set_config_value(key: str, value: Any) -> bool:
     Returns:
         bool: 设置成功返回True，失败返回False
     """
-    config = load_config()
-    config[key] = value
-    return save_config(config)
+    return _mutate(key, value)
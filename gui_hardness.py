@@ -1,13 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import processor
-from gui_shared import ScrollableFrame, browse_file, setup_drag_drop, COLORS
+from gui_shared import ScrollableFrame, browse_file, register_dnd_tree, COLORS
 
 class HardnessFrame(tk.Frame):
     def __init__(self, parent):
         # 初始化时设置背景色
         super().__init__(parent, bg=COLORS['bg_dark'])
         self.cached_hardness_data = [] 
+        self._fmt_cache = {}  # 按显示精度缓存格式化后的 "均值±SD" 字符串
+        # 变量只创建一次，界面重建时保留当前值
+        self.hard_pdf_src = tk.StringVar()
+        self.hard_precision = tk.IntVar(value=1)
         self.setup_ui()
 
     def setup_ui(self):
@@ -24,10 +27,6 @@ class HardnessFrame(tk.Frame):
                              font=('微软雅黑', 11, 'bold'))
         main_frame.pack(fill="both", expand=True, padx=25, pady=25)
 
-        # 变量初始化
-        self.hard_pdf_src = tk.StringVar()
-        self.hard_precision = tk.IntVar(value=1)
-
         # --- 3. 顶部操作区 (Grid布局) ---
 
         # 提示标签
@@ -50,24 +49,16 @@ class HardnessFrame(tk.Frame):
                               relief='flat', cursor='hand2')
         btn_browse.grid(row=1, column=1, sticky='ew', ipady=5, padx=5)
 
-        # 注册拖拽 - 扩展到整个界面
-        setup_drag_drop(self, self.hard_pdf_src)
-        setup_drag_drop(main_frame, self.hard_pdf_src)
-        setup_drag_drop(label_source, self.hard_pdf_src)
-        setup_drag_drop(entry, self.hard_pdf_src)
-
         # 让输入框拉伸
         main_frame.columnconfigure(0, weight=1)
 
         # --- 4. 选项与控制区 ---
         ctrl_frame = tk.Frame(main_frame, bg=COLORS['bg_dark'])
         ctrl_frame.grid(row=2, column=0, columnspan=2, sticky="ew", pady=10)
-        setup_drag_drop(ctrl_frame, self.hard_pdf_src)
 
         # 精度选择
         label_precision = tk.Label(ctrl_frame, text="显示精度: ", bg=COLORS['bg_dark'], fg=COLORS['text'])
         label_precision.pack(side="left")
-        setup_drag_drop(label_precision, self.hard_pdf_src)
         
         style = ttk.Style()
         style.configure('Tech.TRadiobutton', background=COLORS['bg_dark'], foreground=COLORS['text'])
@@ -90,19 +81,22 @@ class HardnessFrame(tk.Frame):
         self.list_container = tk.Frame(main_frame, bg=COLORS['bg_medium'], padx=2, pady=2)
         self.list_container.grid(row=3, column=0, columnspan=2, sticky="nsew", pady=10)
         main_frame.rowconfigure(4, weight=1) # 让列表区占用剩余高度
-        setup_drag_drop(self.list_container, self.hard_pdf_src)
 
         self.hard_scroll = ScrollableFrame(self.list_container, style_bg=COLORS['bg_medium'])
         self.hard_scroll.pack(fill="both", expand=True)
-        setup_drag_drop(self.hard_scroll, self.hard_pdf_src)
-        setup_drag_drop(self.hard_scroll.canvas, self.hard_pdf_src)
-        setup_drag_drop(self.hard_scroll.scrollable_frame, self.hard_pdf_src)
 
-        # 初始提示
-        initial_label = tk.Label(self.hard_scroll.scrollable_frame, text="暂无数据，请先提取...",
-                bg=COLORS['bg_medium'], fg=COLORS['text_dim'], font=('微软雅黑', 10))
-        initial_label.pack(pady=40)
-        setup_drag_drop(initial_label, self.hard_pdf_src)
+        if self.cached_hardness_data:
+            # 主题切换重建界面时恢复已提取的数据
+            self.refresh_hardness_list()
+        else:
+            # 初始提示
+            initial_label = tk.Label(self.hard_scroll.scrollable_frame, text="暂无数据，请先提取...",
+                    bg=COLORS['bg_medium'], fg=COLORS['text_dim'], font=('微软雅黑', 10))
+            initial_label.pack(pady=40)
+            self.hard_scroll.bind_mousewheel(initial_label)
+
+        # 注册拖拽 - 扩展到整个界面（控件全部创建后统一注册一次）
+        register_dnd_tree(self, self.hard_pdf_src)
 
     def start_extract(self):
         p = self.hard_pdf_src.get()
@@ -116,7 +110,16 @@ class HardnessFrame(tk.Frame):
         self.update() 
 
         try:
+            import processor
             self.cached_hardness_data = processor.parse_hardness_report(p)
+            self._fmt_cache = {}
+            # 一次性转换为数值，切换精度时只需重新格式化
+            for item in self.cached_hardness_data:
+                try:
+                    item['_m'] = float(item['mean'])
+                    item['_s'] = float(item['sd'])
+                except (KeyError, TypeError, ValueError):
+                    item['_m'] = None
             self.refresh_hardness_list()
         except Exception as e:
             self.clear_list()
@@ -139,8 +142,11 @@ class HardnessFrame(tk.Frame):
 
         decimals = self.hard_precision.get()
         
+        # 所有行先放入未布局的容器，全部创建完成后再一次性pack，避免逐行触发滚动区重排
+        body = tk.Frame(self.hard_scroll.scrollable_frame, bg=COLORS['bg_medium'])
+        
         # --- 列表表头 ---
-        header_frame = tk.Frame(self.hard_scroll.scrollable_frame, bg=COLORS['bg_light'], height=30)
+        header_frame = tk.Frame(body, bg=COLORS['bg_light'], height=30)
         header_frame.pack(fill="x", pady=(0, 2))
         
         headers = [("序号", 8), ("Mean ± SD (硬度值)", 30), ("操作", 10)]
@@ -149,30 +155,25 @@ class HardnessFrame(tk.Frame):
                     bg=COLORS['bg_light'], fg=COLORS['text'], font=('微软雅黑', 9, 'bold')).pack(side="left", padx=5, pady=5)
 
         # --- 数据行 ---
-        for i, item in enumerate(self.cached_hardness_data):
+        val_strs = self.format_values(decimals)
+        for i, (item, val_str) in enumerate(zip(self.cached_hardness_data, val_strs)):
             # 斑马纹交替颜色
             row_bg = COLORS['row_even'] if i % 2 == 0 else COLORS['row_odd']
             
-            row_frame = tk.Frame(self.hard_scroll.scrollable_frame, bg=row_bg)
+            row_frame = tk.Frame(body, bg=row_bg)
             row_frame.pack(fill="x", pady=1)
-            
-            try:
-                m = float(item['mean'])
-                s = float(item['sd'])
-                val_str = f"{m:.{decimals}f}±{s:.{decimals}f}"
-            except:
-                val_str = f"{item['mean']}±{item['sd']}"
 
             # 序号
             tk.Label(row_frame, text=f"Group {item['id']}", width=8, anchor="w",
                     bg=row_bg, fg=COLORS['text']).pack(side="left", padx=5, pady=8)
             
-            # 数值显示 (Entry)
+            # 数值显示 (只读Entry，不可编辑但仍可选中复制)
             lbl_val = tk.Entry(row_frame, width=30, justify='center', font=('Arial', 10),
                              bg=COLORS['input_bg'], fg=COLORS['accent'],
+                             readonlybackground=COLORS['input_bg'],
                              relief='flat', bd=0)
             lbl_val.insert(0, val_str)
-            # lbl_val.configure(state='readonly') # 如果想要完全只读可以取消注释，但这样无法选中复制
+            lbl_val.configure(state='readonly')
             lbl_val.pack(side="left", padx=5)
             
             # 复制按钮
@@ -181,6 +182,21 @@ class HardnessFrame(tk.Frame):
             btn.configure(command=lambda t=val_str, b=btn: self.copy_to_clipboard(t, b))
             btn.pack(side="left", padx=5)
 
+        body.pack(fill="x")
+        self.hard_scroll.bind_mousewheel(body)
+
+    def format_values(self, decimals):
+        """按指定精度格式化所有组的 "均值±SD"，结果按精度缓存"""
+        if decimals not in self._fmt_cache:
+            values = []
+            for item in self.cached_hardness_data:
+                if item.get('_m') is not None:
+                    values.append(f"{item['_m']:.{decimals}f}±{item['_s']:.{decimals}f}")
+                else:
+                    values.append(f"{item['mean']}±{item['sd']}")
+            self._fmt_cache[decimals] = values
+        return self._fmt_cache[decimals]
+
     def copy_to_clipboard(self, text, btn_widget):
         self.clipboard_clear()
         self.clipboard_append(text)
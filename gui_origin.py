@@ -22,31 +22,42 @@ Copyright (c) 2024 育材堂. All rights reserved.
 """
 
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import messagebox
 import os
-from tkinterdnd2 import DND_FILES
-import origin_processor
+import traceback
 import config_manager
-from gui_shared import COLORS
+from gui_shared import parse_drop_paths, COLORS
+
+# 拖拽支持在导入时检测一次，未安装tkinterdnd2时跳过注册
+try:
+    from tkinterdnd2 import DND_FILES
+    _DND_OK = True
+except ImportError:
+    DND_FILES = None
+    _DND_OK = False
 
 class OriginFrame(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent, bg=COLORS['bg_dark'])
         self.file_list = []
+        # 变量只创建一次，界面重建时保留当前值
+        self.o_template_path = tk.StringVar(value=config_manager.get_template('phase_template'))
+        self.o_width = tk.DoubleVar(value=11.0)
+        self.o_height = tk.DoubleVar(value=8.8)
+        self.o_copy_to_ppt = tk.BooleanVar(value=False)  # 默认不复制到PPT
         self.setup_ui()
 
     def setup_ui(self):
         for widget in self.winfo_children():
             widget.destroy()
         self.configure(bg=COLORS['bg_dark'])
+        self._dnd_widgets = []
 
         main_frame = tk.LabelFrame(self, text="🔥 相变点绘图", padx=20, pady=20,
                              bg=COLORS['bg_dark'], fg=COLORS['accent'],
                              font=('微软雅黑', 11, 'bold'))
         main_frame.pack(fill="both", expand=True, padx=25, pady=25)
 
-        self.o_template_path = tk.StringVar(value=config_manager.get_template('phase_template'))
-
         label_hint = tk.Label(main_frame, text="拖拽CSV文件到下方区域（支持多文件）| 💡 可拖拽到整个界面任意位置",
                 bg=COLORS['bg_dark'], fg=COLORS['text'],
                 font=('微软雅黑', 10))
@@ -55,24 +66,15 @@ class OriginFrame(tk.Frame):
         self.drop_zone = tk.Listbox(main_frame, height=8, bg=COLORS['input_bg'], fg=COLORS['text'],
                                    selectmode=tk.EXTENDED, font=('Consolas', 9))
         self.drop_zone.grid(row=1, column=0, columnspan=3, sticky='nsew', pady=10)
+        # 主题切换重建界面时恢复已添加的文件
+        self.drop_zone.insert(tk.END, *map(os.path.basename, self.file_list))
 
-        def do_register():
-            try:
-                self.drop_zone.drop_target_register(DND_FILES)
-                self.drop_zone.dnd_bind('<<Drop>>', self.on_drop)
-            except Exception as e:
-                print(f"拖拽注册失败: {e}")
-
-        self.drop_zone.after(100, do_register)
-
-        # 注册拖拽 - 扩展到整个界面
+        # 注册拖拽 - 子控件上的拖放会冒泡到已注册的父控件，整个界面都可拖入
+        self._setup_dnd(self.drop_zone)
         self._setup_dnd(self)
-        self._setup_dnd(main_frame)
-        self._setup_dnd(label_hint)
 
         btn_frame = tk.Frame(main_frame, bg=COLORS['bg_dark'])
         btn_frame.grid(row=2, column=0, columnspan=3, sticky='ew', pady=5)
-        self._setup_dnd(btn_frame)
 
         tk.Button(btn_frame, text="添加文件", command=self.add_files,
                  bg=COLORS['bg_light'], fg=COLORS['text'], relief='flat').pack(side='left', padx=5)
@@ -85,23 +87,16 @@ class OriginFrame(tk.Frame):
         tk.Button(main_frame, text="选择", command=self.browse_template, bg=COLORS['bg_light'], fg=COLORS['text'], relief='flat').grid(row=3, column=2)
 
         # 图片尺寸选项
-        self.o_width = tk.DoubleVar(value=11.0)
-        self.o_height = tk.DoubleVar(value=8.8)
-        self.o_copy_to_ppt = tk.BooleanVar(value=False)  # 默认不复制到PPT
-
         size_frame = tk.Frame(main_frame, bg=COLORS['bg_dark'])
         size_frame.grid(row=4, column=0, columnspan=3, sticky='w', pady=5)
-        self._setup_dnd(size_frame)
 
         label_width = tk.Label(size_frame, text="图片宽(cm):", bg=COLORS['bg_dark'], fg=COLORS['text'])
         label_width.pack(side='left')
-        self._setup_dnd(label_width)
 
         tk.Spinbox(size_frame, from_=5, to=30, textvariable=self.o_width, width=5, bg=COLORS['input_bg'], fg=COLORS['text'], increment=0.5).pack(side='left', padx=(5,15))
 
         label_height = tk.Label(size_frame, text="图片高(cm):", bg=COLORS['bg_dark'], fg=COLORS['text'])
         label_height.pack(side='left')
-        self._setup_dnd(label_height)
 
         tk.Spinbox(size_frame, from_=5, to=25, textvariable=self.o_height, width=5, bg=COLORS['input_bg'], fg=COLORS['text'], increment=0.5).pack(side='left', padx=5)
 
@@ -112,10 +107,12 @@ class OriginFrame(tk.Frame):
                  bg=COLORS['success'], fg=COLORS['button_fg'], font=("微软雅黑", 12, "bold"),
                  relief='flat', cursor='hand2')
         btn_plot.grid(row=5, column=0, columnspan=3, sticky='ew', ipady=10, pady=15)
-        self._setup_dnd(btn_plot)
 
         main_frame.columnconfigure(1, weight=1)
 
+        # 所有拖拽目标共用一个延迟注册定时器
+        self.after(100, self._register_dnd)
+
     def on_drop(self, event):
         files = self.parse_drop_data(event.data)
         for f in files:
@@ -124,18 +121,10 @@ class OriginFrame(tk.Frame):
                 self.drop_zone.insert(tk.END, os.path.basename(f))
 
     def parse_drop_data(self, data):
-        files = []
-        if '{' in data:
-            import re
-            files = re.findall(r'\{([^}]+)\}', data)
-            remaining = re.sub(r'\{[^}]+\}', '', data).strip()
-            if remaining:
-                files.extend(remaining.split())
-        else:
-            files = data.split()
-        return [f.strip() for f in files if f.strip()]
+        return parse_drop_paths(data, self)
 
     def add_files(self):
+        from tkinter import filedialog
         paths = filedialog.askopenfilenames(filetypes=[("CSV Files", "*.csv")])
         for p in paths:
             if p not in self.file_list:
@@ -147,6 +136,7 @@ class OriginFrame(tk.Frame):
         self.drop_zone.delete(0, tk.END)
 
     def browse_template(self):
+        from tkinter import filedialog
         p = filedialog.askopenfilename(
             initialdir="C:/Users/deity/Documents/OriginLab/User Files",
             filetypes=[("Origin Template", "*.otpu *.otp")])
@@ -159,6 +149,7 @@ class OriginFrame(tk.Frame):
             return messagebox.showwarning("提示", "请先添加CSV文件")
         
         # 检查Origin连接
+        import origin_processor
         success, err = origin_processor.init_origin()
         if not success:
             return messagebox.showerror("Origin连接失败", err)
@@ -184,26 +175,23 @@ class OriginFrame(tk.Frame):
                 opju_path, count = result
                 messagebox.showinfo("完成", f"成功！已在Origin中创建 {count} 张图表\nOrigin项目: {opju_path}")
         except Exception as e:
-            import traceback
             messagebox.showerror("错误", f"{e}\n{traceback.format_exc()}")
 
     def set_data_source(self, path):
         pass
 
     def _setup_dnd(self, widget):
-        """设置拖拽"""
-        def on_drop(event):
-            files = self.parse_drop_data(event.data)
-            for f in files:
-                if f.endswith('.csv') and f not in self.file_list:
-                    self.file_list.append(f)
-                    self.drop_zone.insert(tk.END, os.path.basename(f))
-
-        def do_register():
+        """登记拖拽目标，由 _register_dnd 统一注册"""
+        self._dnd_widgets.append(widget)
+
+    def _register_dnd(self):
+        """注册所有已登记的拖拽目标"""
+        if not _DND_OK:
+            return
+        for widget in self._dnd_widgets:
+            # tkdnd扩展加载失败或根窗口不是TkinterDnD.Tk时跳过该控件，继续注册其余控件
             try:
                 widget.drop_target_register(DND_FILES)
-                widget.dnd_bind('<<Drop>>', on_drop)
-            except Exception as e:
+                widget.dnd_bind('<<Drop>>', self.on_drop)
+            except tk.TclError as e:
                 print(f"拖拽注册失败: {e}")
-
-        widget.after(100, do_register)
@@ -16,7 +16,7 @@
     - THEMES: 深色/亮色主题配色方案
     - COLORS: 当前活动的颜色配置
     - ScrollableFrame: 可滚动的Frame容器组件
-    - 文件拖拽处理函数
+    - 文件拖拽处理函数（单控件/控件树/Listbox）
     - 路径处理工具函数
 
 Copyright (c) 2026 育材堂. All rights reserved.
@@ -28,14 +28,20 @@ Copyright (c) 2026 育材堂. All rights reserved.
 import os
 import sys
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional, Callable, Any
 
 # ============================================================
 # 第三方库导入
 # ============================================================
 import tkinter as tk
-from tkinter import ttk, filedialog
-from tkinterdnd2 import DND_FILES
+from tkinter import ttk
+
+# 拖拽数据中的单个路径：花括号包裹的路径（含空格）或不含空白的普通路径
+_DROP_RE = re.compile(r'\{([^}]*)\}|(\S+)')
+
+# 延迟导入tkinterdnd2（加载Tcl扩展开销较大，首次注册拖拽时才导入）
+_DND_FILES: Optional[str] = None
 
 # ============================================================
 # 版本信息
@@ -105,11 +111,16 @@ def update_theme_colors(mode: str = 'dark') -> None:
 # ============================================================
 # 路径工具函数
 # ============================================================
+# 资源根目录：PyInstaller打包后为解压目录，否则为启动时的工作目录
+_RESOURCE_BASE: str = getattr(sys, '_MEIPASS', None) or os.path.abspath(".")
+
+
+@lru_cache(maxsize=None)
 def resource_path(relative_path: str) -> str:
     """
     获取资源文件的绝对路径
     
-    支持PyInstaller打包后的资源路径解析。
+    支持PyInstaller打包后的资源路径解析。解析结果按相对路径缓存。
     
     Args:
         relative_path: 相对路径
@@ -117,16 +128,15 @@ def resource_path(relative_path: str) -> str:
     Returns:
         str: 资源文件的绝对路径
     """
-    if hasattr(sys, '_MEIPASS'):
-        return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.abspath("."), relative_path)
+    return os.path.join(_RESOURCE_BASE, relative_path)
 
 
 def get_unique_path(path: str) -> str:
     """
     生成唯一文件路径
     
-    如果文件已存在，则在文件名后添加序号。
+    如果文件已存在，则在文件名后添加递增序号（如 _1、_2），取第一个空闲序号。
+    只列一次目录查找空闲序号。
     
     Args:
         path: 原始文件路径
@@ -138,8 +148,14 @@ def get_unique_path(path: str) -> str:
         return path
     
     base, ext = os.path.splitext(path)
+    folder = os.path.dirname(path) or "."
+    try:
+        existing = {os.path.normcase(name) for name in os.listdir(folder)}
+    except OSError:
+        existing = set()
+    stem = os.path.basename(base)
     i = 1
-    while os.path.exists(f"{base}_{i}{ext}"):
+    while os.path.normcase(f"{stem}_{i}{ext}") in existing:
         i += 1
     return f"{base}_{i}{ext}"
 
@@ -155,6 +171,7 @@ def browse_file(string_var: tk.StringVar, file_types: List[tuple]) -> None:
         string_var: 用于存储选中文件路径的StringVar
         file_types: 文件类型过滤器列表，如 [("Excel Files", "*.xlsx")]
     """
+    from tkinter import filedialog  # 首次打开对话框时才导入
     path = filedialog.askopenfilename(filetypes=file_types)
     if path:
         string_var.set(path)
@@ -163,28 +180,42 @@ def browse_file(string_var: tk.StringVar, file_types: List[tuple]) -> None:
 # ============================================================
 # 拖拽处理函数
 # ============================================================
-def parse_drop_paths(data: str) -> List[str]:
+def _get_dnd_files() -> str:
+    """
+    获取tkinterdnd2的文件拖拽类型常量（首次调用时导入）
+    
+    Returns:
+        str: DND_FILES常量
+    """
+    global _DND_FILES
+    if _DND_FILES is None:
+        from tkinterdnd2 import DND_FILES
+        _DND_FILES = DND_FILES
+    return _DND_FILES
+
+
+def parse_drop_paths(data: str, widget: Optional[tk.Widget] = None) -> List[str]:
     """
     解析拖拽数据中的文件路径
     
-    处理Windows拖拽事件中的文件路径数据，支持带空格的路径。
+    拖拽数据是Tcl列表格式，传入widget时直接交给Tcl的splitlist解析，
+    可正确处理带空格和花括号的路径；未传入widget或解析失败时使用正则解析。
     
     Args:
         data: 拖拽事件的原始数据字符串
+        widget: 接收拖拽事件的控件（可选）
         
     Returns:
         List[str]: 解析出的文件路径列表
     """
-    if '{' in data:
-        # 处理带花括号的路径（包含空格的路径）
-        paths = re.findall(r'\{([^}]+)\}', data)
-        if not paths and data.startswith('{') and data.endswith('}'):
-            paths = [data[1:-1]]
-    else:
-        # 普通空格分隔的路径
-        paths = data.split()
+    if widget is not None:
+        try:
+            return [p for p in widget.tk.splitlist(data) if p]
+        except tk.TclError:
+            pass
     
-    return [p for p in paths if p]
+    # 单次扫描，按出现顺序提取花括号路径（含空格）和普通路径
+    return [braced or plain for braced, plain in _DROP_RE.findall(data) if braced or plain]
 
 
 def setup_drag_drop(widget: tk.Widget, string_var: tk.StringVar) -> bool:
@@ -201,12 +232,12 @@ def setup_drag_drop(widget: tk.Widget, string_var: tk.StringVar) -> bool:
         bool: 注册成功返回True，失败返回False
     """
     def _on_drop(event) -> None:
-        paths = parse_drop_paths(event.data)
+        paths = parse_drop_paths(event.data, widget)
         if paths:
             string_var.set(paths[0])
     
     try:
-        widget.drop_target_register(DND_FILES)
+        widget.drop_target_register(_get_dnd_files())
         widget.dnd_bind('<<Drop>>', _on_drop)
         return True
     except Exception as e:
@@ -214,6 +245,39 @@ def setup_drag_drop(widget: tk.Widget, string_var: tk.StringVar) -> bool:
         return False
 
 
+def register_dnd_tree(root_widget: tk.Widget, string_var: tk.StringVar) -> bool:
+    """
+    为控件树整体注册单文件拖拽功能
+    
+    遍历root_widget及其全部子控件，共用同一个拖拽处理函数完成注册，
+    应在界面控件全部创建完成后调用一次。
+    
+    Args:
+        root_widget: 控件树的根控件
+        string_var: 用于存储拖拽文件路径的StringVar
+        
+    Returns:
+        bool: 全部注册成功返回True，任一控件失败返回False
+    """
+    def _on_drop(event) -> None:
+        paths = parse_drop_paths(event.data, root_widget)
+        if paths:
+            string_var.set(paths[0])
+    
+    ok = True
+    pending = [root_widget]
+    while pending:
+        widget = pending.pop()
+        try:
+            widget.drop_target_register(_get_dnd_files())
+            widget.dnd_bind('<<Drop>>', _on_drop)
+        except Exception as e:
+            print(f"拖拽注册失败: {e}")
+            ok = False
+        pending.extend(widget.winfo_children())
+    return ok
+
+
 def setup_drag_drop_listbox(
     listbox: tk.Listbox,
     file_list: List[str],
@@ -231,16 +295,22 @@ def setup_drag_drop_listbox(
         bool: 注册成功返回True，失败返回False
     """
     def _on_drop(event) -> None:
-        paths = parse_drop_paths(event.data)
+        paths = parse_drop_paths(event.data, listbox)
+        # 用集合去重，并一次性插入所有新文件名
+        seen = set(file_list)
+        new_paths = []
         for p in paths:
-            if p and p not in file_list:
-                file_list.append(p)
-                listbox.insert('end', os.path.basename(p))
+            if p and p not in seen:
+                seen.add(p)
+                new_paths.append(p)
+        if new_paths:
+            file_list.extend(new_paths)
+            listbox.insert('end', *map(os.path.basename, new_paths))
         if callback:
             callback()
     
     try:
-        listbox.drop_target_register(DND_FILES)
+        listbox.drop_target_register(_get_dnd_files())
         listbox.dnd_bind('<<Drop>>', _on_drop)
         return True
     except Exception as e:
@@ -280,11 +350,9 @@ class ScrollableFrame(ttk.Frame):
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
         self.scrollable_frame = tk.Frame(self.canvas, bg=bg_color)
 
-        # 配置滚动区域
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
+        # 配置滚动区域（合并连续的尺寸变化，空闲时统一更新一次）
+        self._scrollregion_pending = False
+        self.scrollable_frame.bind("<Configure>", self._on_inner_configure)
 
         # 创建窗口
         self.canvas_window = self.canvas.create_window(
@@ -297,36 +365,54 @@ class ScrollableFrame(ttk.Frame):
         self.canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # 绑定鼠标滚轮事件
-        self.scrollable_frame.bind('<Enter>', self._bind_mouse)
-        self.scrollable_frame.bind('<Leave>', self._unbind_mouse)
+        # 绑定鼠标滚轮事件：使用本实例专属的bindtag，一次绑定，
+        # 需要响应滚轮的控件加入该bindtag即可（无需在进出时反复bind_all/unbind_all）
+        self._wheel_tag = f"ScrollableFrameWheel{id(self)}"
+        self.bind_class(self._wheel_tag, '<MouseWheel>', self._on_mousewheel)
+        self.bind_mousewheel(self.canvas)
+        self.bind_mousewheel(self.scrollable_frame)
 
-    def _on_canvas_configure(self, event: tk.Event) -> None:
+    def _on_inner_configure(self, event: tk.Event) -> None:
         """
-        Canvas大小变化时调整内容宽度
+        内容Frame大小变化时安排更新滚动区域
         
         Args:
             event: Configure事件
         """
-        self.canvas.itemconfig(self.canvas_window, width=event.width)
+        if not self._scrollregion_pending:
+            self._scrollregion_pending = True
+            self.after_idle(self._apply_scrollregion)
+
+    def _apply_scrollregion(self) -> None:
+        """根据当前内容更新Canvas滚动区域"""
+        self._scrollregion_pending = False
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
-    def _bind_mouse(self, event: tk.Event) -> None:
+    def _on_canvas_configure(self, event: tk.Event) -> None:
         """
-        鼠标进入时绑定滚轮事件
+        Canvas大小变化时调整内容宽度
         
         Args:
-            event: Enter事件
+            event: Configure事件
         """
-        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
-        
-    def _unbind_mouse(self, event: tk.Event) -> None:
+        self.canvas.itemconfig(self.canvas_window, width=event.width)
+
+    def bind_mousewheel(self, widget: Optional[tk.Widget] = None) -> None:
         """
-        鼠标离开时解绑滚轮事件
+        让控件及其所有子控件响应本容器的滚轮滚动
+        
+        向内容区动态添加控件后调用，为新控件加入滚轮bindtag。
         
         Args:
-            event: Leave事件
+            widget: 控件树的根控件，默认为内容Frame
         """
-        self.canvas.unbind_all("<MouseWheel>")
+        pending = [widget if widget is not None else self.scrollable_frame]
+        while pending:
+            w = pending.pop()
+            tags = w.bindtags()
+            if self._wheel_tag not in tags:
+                w.bindtags((self._wheel_tag,) + tags)
+            pending.extend(w.winfo_children())
         
     def _on_mousewheel(self, event: tk.Event) -> None:
         """
@@ -335,7 +421,11 @@ class ScrollableFrame(ttk.Frame):
         Args:
             event: MouseWheel事件
         """
-        self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        if event.delta == 0:
+            return
+        # 按滚动量成比例滚动（一格为120）；高精度滚轮/触控板的小增量至少滚动1个单位
+        units = int(-event.delta / 120) or (-1 if event.delta > 0 else 1)
+        self.canvas.yview_scroll(units, "units")
     
     def update_bg(self, color: str) -> None:
         """
@@ -1,28 +1,40 @@
 import tkinter as tk
-from tkinter import messagebox, filedialog
+from tkinter import messagebox
 import os
-import tensile_processor
-import origin_processor
 import config_manager
-from gui_shared import resource_path, browse_file, get_unique_path, COLORS
-from tkinterdnd2 import DND_FILES
+from gui_shared import resource_path, browse_file, get_unique_path, parse_drop_paths, COLORS
+
+# 拖拽支持在导入时检测一次，未安装tkinterdnd2时跳过注册
+try:
+    from tkinterdnd2 import DND_FILES
+    _DND_OK = True
+except ImportError:
+    DND_FILES = None
+    _DND_OK = False
 
 class TensileFrame(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent, bg=COLORS['bg_dark'])
+        self._frame = None  # 界面根容器，重建界面时整体销毁
+        self._pptx_template = None  # 已校验存在的PPT模板路径
+        # 变量只创建一次，界面重建时保留当前值
+        self.v_tensile_src = tk.StringVar()
+        self.v_include_ag = tk.BooleanVar(value=True)
+        self.o_template = tk.StringVar(value=config_manager.get_template('tensile_template'))
+        self.o_lines = tk.IntVar(value=12)
+        self.o_swap_xy = tk.BooleanVar(value=True)
+        self.o_width = tk.DoubleVar(value=15.0)
+        self.o_height = tk.DoubleVar(value=12.0)
+        self.o_copy_to_ppt = tk.BooleanVar(value=False)  # 默认不复制到PPT
         self.setup_ui()
 
     def setup_ui(self):
-        for widget in self.winfo_children():
-            widget.destroy()
+        if self._frame is not None:
+            self._frame.destroy()
         self.configure(bg=COLORS['bg_dark'])
         
-        frame = tk.LabelFrame(self, text="📊 拉伸实验报告生成", padx=20, pady=20,
+        frame = self._frame = tk.LabelFrame(self, text="📊 拉伸实验报告生成", padx=20, pady=20,
                              bg=COLORS['bg_dark'], fg=COLORS['accent'], font=('微软雅黑', 11, 'bold'))
-        frame.pack(fill="x", padx=25, pady=25)
-        
-        self.v_tensile_src = tk.StringVar()
-        self.v_include_ag = tk.BooleanVar(value=True)
         
         # 文件选择
         label_source = tk.Label(frame, text="选择原始数据文件 (Word/Excel) | 💡 可拖拽到整个界面任意位置", bg=COLORS['bg_dark'], fg=COLORS['text'], font=('微软雅黑', 10))
@@ -35,29 +47,18 @@ class TensileFrame(tk.Frame):
         tk.Button(frame, text="📂 浏览", command=lambda: browse_file(self.v_tensile_src, [("Data Files", "*.xlsx *.xls *.csv *.docx")]),
                  bg=COLORS['bg_light'], fg=COLORS['text'], font=('微软雅黑', 9), relief='flat', cursor='hand2', padx=15).grid(row=1, column=3, padx=5, ipady=5)
 
-        # 注册拖拽 - 扩展到整个界面
+        # 注册拖拽 - 子控件上的拖放会冒泡到已注册的父控件，整个界面都可拖入
         self._setup_dnd(self)
-        self._setup_dnd(frame)
-        self._setup_dnd(label_source)
         self._setup_dnd(entry)
 
         # 选项
         opt_frame = tk.Frame(frame, bg=COLORS['bg_dark'])
         opt_frame.grid(row=2, column=0, columnspan=4, sticky='w', pady=5)
-        self._setup_dnd(opt_frame)
         tk.Checkbutton(opt_frame, text="包含 Ag (最大力总延伸率)", variable=self.v_include_ag, bg=COLORS['bg_dark'], fg=COLORS['text'], selectcolor=COLORS['bg_medium'], font=('微软雅黑', 9)).pack(side="left")
 
         # 绘图选项
         self.plot_frame = tk.LabelFrame(frame, text="绘图选项", padx=10, pady=10, bg=COLORS['bg_dark'], fg=COLORS['text_dim'], font=('微软雅黑', 9))
         self.plot_frame.grid(row=3, column=0, columnspan=4, sticky='ew', pady=10)
-        self._setup_dnd(self.plot_frame)
-
-        self.o_template = tk.StringVar(value=config_manager.get_template('tensile_template'))
-        self.o_lines = tk.IntVar(value=12)
-        self.o_swap_xy = tk.BooleanVar(value=True)
-        self.o_width = tk.DoubleVar(value=15.0)
-        self.o_height = tk.DoubleVar(value=12.0)
-        self.o_copy_to_ppt = tk.BooleanVar(value=False)  # 默认不复制到PPT
 
         tk.Label(self.plot_frame, text="模板:", bg=COLORS['bg_dark'], fg=COLORS['text']).grid(row=0, column=0, sticky='w')
         tk.Entry(self.plot_frame, textvariable=self.o_template, width=25, bg=COLORS['input_bg'], fg=COLORS['text']).grid(row=0, column=1, sticky='ew', padx=5)
@@ -71,7 +72,6 @@ class TensileFrame(tk.Frame):
         # 图片尺寸选项（放在同一行）
         size_frame = tk.Frame(self.plot_frame, bg=COLORS['bg_dark'])
         size_frame.grid(row=1, column=0, columnspan=6, sticky='w', pady=(5,0))
-        self._setup_dnd(size_frame)
 
         tk.Label(size_frame, text="图片宽(cm):", bg=COLORS['bg_dark'], fg=COLORS['text']).pack(side='left')
         tk.Spinbox(size_frame, from_=5, to=30, textvariable=self.o_width, width=5, bg=COLORS['input_bg'], fg=COLORS['text'], increment=0.5).pack(side='left', padx=(5,15))
@@ -86,35 +86,32 @@ class TensileFrame(tk.Frame):
         # 按钮放最后一排
         btn_frame = tk.Frame(frame, bg=COLORS['bg_dark'])
         btn_frame.grid(row=4, column=0, columnspan=4, pady=15, sticky='ew')
-        self._setup_dnd(btn_frame)
 
         tk.Button(btn_frame, text="📋 仅提取数据", command=self.run_extract_only, bg=COLORS['accent'], fg=COLORS['button_fg'], font=("微软雅黑", 10, "bold"), relief='flat', cursor='hand2').pack(side='left', expand=True, fill='x', padx=2, ipady=10)
         tk.Button(btn_frame, text="📈 仅绘图", command=self.run_plot_only, bg=COLORS['success'], fg=COLORS['button_fg'], font=("微软雅黑", 10, "bold"), relief='flat', cursor='hand2').pack(side='left', expand=True, fill='x', padx=2, ipady=10)
         
         frame.columnconfigure(1, weight=1)
+        # 子控件全部创建完成后再布局外层容器，只触发一次整体布局计算
+        frame.pack(fill="x", padx=25, pady=25)
 
     def _setup_dnd(self, widget):
         """设置拖拽"""
-        def on_drop(event):
-            data = event.data
-            if '{' in data:
-                import re
-                paths = re.findall(r'\{([^}]+)\}', data)
-                path = paths[0] if paths else data.strip('{}')
-            else:
-                path = data.split()[0] if data.split() else data
-            self.v_tensile_src.set(path)
-        
-        def do_register():
-            try:
-                widget.drop_target_register(DND_FILES)
-                widget.dnd_bind('<<Drop>>', on_drop)
-            except Exception as e:
-                print(f"拖拽注册失败: {e}")
-        
-        widget.after(100, do_register)
+        if not _DND_OK:
+            return
+        # tkdnd扩展加载失败或根窗口不是TkinterDnD.Tk时跳过，不影响界面创建
+        try:
+            widget.drop_target_register(DND_FILES)
+            widget.dnd_bind('<<Drop>>', self._on_drop)
+        except tk.TclError as e:
+            print(f"拖拽注册失败: {e}")
+
+    def _on_drop(self, event):
+        """拖拽回调，所有拖拽目标共用"""
+        paths = parse_drop_paths(event.data, self)
+        self.v_tensile_src.set(paths[0] if paths else "")
 
     def browse_template(self):
+        from tkinter import filedialog
         p = filedialog.askopenfilename(initialdir="C:/Users/deity/Documents/OriginLab/User Files", filetypes=[("Origin Template", "*.otpu *.otp")])
         if p:
             self.o_template.set(p)
@@ -124,14 +121,18 @@ class TensileFrame(tk.Frame):
         src = self.v_tensile_src.get()
         if not src: return messagebox.showwarning("提示", "请先选择数据文件")
 
-        pptx = resource_path("拉伸模板.pptx")
-        if not os.path.exists(pptx): return messagebox.showerror("错误", "未找到模板文件")
+        if self._pptx_template is None:
+            pptx = resource_path("拉伸模板.pptx")
+            if not os.path.exists(pptx): return messagebox.showerror("错误", "未找到模板文件")
+            self._pptx_template = pptx
+        pptx = self._pptx_template
 
         folder = os.path.dirname(src)
         fname = os.path.splitext(os.path.basename(src))[0]
         out = get_unique_path(os.path.join(folder, f"拉伸报告_{fname}.pptx"))
 
         try:
+            import tensile_processor
             msg = tensile_processor.generate_report(src, pptx, out, self.v_include_ag.get())
             if msg and "错误" not in msg:
                 messagebox.showinfo("成功", msg)
@@ -146,6 +147,7 @@ class TensileFrame(tk.Frame):
         if not src: return messagebox.showwarning("提示", "请先选择数据文件")
 
         # 检查Origin连接
+        import origin_processor
         success, err = origin_processor.init_origin()
         if not success:
             return messagebox.showerror("Origin连接失败", err)
@@ -36,9 +36,11 @@ Copyright (c) 2026 育材堂. All rights reserved.
 # ============================================================
 # 标准库导入
 # ============================================================
+import importlib
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional, Set
 
 # ============================================================
 # 第三方库导入
@@ -48,12 +50,15 @@ from tkinterdnd2 import TkinterDnD
 # ============================================================
 # 本地模块导入
 # ============================================================
-from gui_tensile import TensileFrame
-from gui_vda import VDAFrame
-from gui_hardness import HardnessFrame
-from gui_origin import OriginFrame
 from gui_shared import COLORS, update_theme_colors
 
+# 标签页模块在首次创建该页时才导入（见 MainApp.build_tab）
+if TYPE_CHECKING:
+    from gui_tensile import TensileFrame
+    from gui_vda import VDAFrame
+    from gui_hardness import HardnessFrame
+    from gui_origin import OriginFrame
+
 # ============================================================
 # 版本信息
 # ============================================================
@@ -62,6 +67,19 @@ __author__ = "张桢"
 __copyright__ = "Copyright (c) 2026 育材堂"
 __license__ = "Proprietary"
 
+# 数据源同步的延迟时间（毫秒）
+SYNC_DELAY_MS = 250
+# 可同步到Origin绘图模块的数据文件扩展名
+DATA_SOURCE_EXTS = ('.xlsx', '.xls', '.csv')
+
+# 功能标签页：(MainApp属性名, 模块名, 标签页类名, 标签文字)，按显示顺序排列
+TAB_SPECS = (
+    ('tab_tensile', 'gui_tensile', 'TensileFrame', "  ⚡ 拉伸报告  "),
+    ('tab_vda', 'gui_vda', 'VDAFrame', "  📐 VDA弯曲  "),
+    ('tab_hard', 'gui_hardness', 'HardnessFrame', "  💎 硬度提取  "),
+    ('tab_origin', 'gui_origin', 'OriginFrame', "  🔥 相变点绘图  "),
+)
+
 
 class MainApp:
     """
@@ -77,6 +95,7 @@ class MainApp:
         tab_vda: VDA弯曲报告标签页
         tab_hard: 硬度提取标签页
         tab_origin: 相变点绘图标签页
+        btn_theme: 主题切换按钮
     """
     
     def __init__(self, root: TkinterDnD.Tk) -> None:
@@ -92,10 +111,19 @@ class MainApp:
         
         self.current_theme: str = 'light'
         self.notebook: Optional[ttk.Notebook] = None
-        self.tab_tensile: Optional[TensileFrame] = None
-        self.tab_vda: Optional[VDAFrame] = None
-        self.tab_hard: Optional[HardnessFrame] = None
-        self.tab_origin: Optional[OriginFrame] = None
+        self.tab_tensile: Optional["TensileFrame"] = None
+        self.tab_vda: Optional["VDAFrame"] = None
+        self.tab_hard: Optional["HardnessFrame"] = None
+        self.tab_origin: Optional["OriginFrame"] = None
+        self.btn_theme: Optional[ttk.Button] = None
+        # 数据源同步的延迟回调ID（合并连续输入）
+        self._sync_after_id: Optional[str] = None
+        # 最近一次同步到Origin绘图模块的数据源，相同路径不重复同步
+        self._last_origin_src: Optional[str] = None
+        # 各标签页的占位容器，标签页内容首次切换到该页时才创建
+        self._tab_holders: List[ttk.Frame] = []
+        # 主题切换后尚未重建的隐藏标签页序号，切换到该页时再重建
+        self._stale_tabs: Set[int] = set()
         
         self.setup_ui()
 
@@ -106,10 +134,6 @@ class MainApp:
         创建主窗口的所有UI组件，包括标题栏、标签页和状态栏。
         """
         self.root.configure(bg=COLORS['bg_dark'])
-        
-        # 清除现有控件（用于主题切换时重建UI）
-        for widget in self.root.winfo_children():
-            widget.destroy()
 
         self.configure_styles()
         self.create_header()
@@ -118,29 +142,63 @@ class MainApp:
         self.notebook = ttk.Notebook(self.root, style='Tech.TNotebook')
         self.notebook.pack(fill="both", expand=True, padx=15, pady=(0, 10))
         
-        # 添加功能标签页
-        self.tab_tensile = TensileFrame(self.notebook)
-        self.notebook.add(self.tab_tensile, text="  ⚡ 拉伸报告  ")
+        # 添加功能标签页（先放占位容器，只创建当前显示的第一页）
+        for *_, text in TAB_SPECS:
+            holder = ttk.Frame(self.notebook)
+            self.notebook.add(holder, text=text)
+            self._tab_holders.append(holder)
+        self.build_tab(0)
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
         
-        self.tab_vda = VDAFrame(self.notebook)
-        self.notebook.add(self.tab_vda, text="  📐 VDA弯曲  ")
+        self.create_status_bar()
 
-        self.tab_hard = HardnessFrame(self.notebook)
-        self.notebook.add(self.tab_hard, text="  💎 硬度提取  ")
+        # pack只登记布局请求，几何计算由Tk合并到空闲时执行；全部控件创建完成后统一刷新一次。
+        # 构建界面期间（包括各标签页的setup_ui）不要调用update()或winfo_*查询，以免触发中间布局。
+        self.root.update_idletasks()
 
-        self.tab_origin = OriginFrame(self.notebook)
-        self.notebook.add(self.tab_origin, text="  🔥 相变点绘图  ")
+    def build_tab(self, index: int) -> None:
+        """
+        创建标签页内容
         
-        # 数据源同步：拉伸报告数据变化时同步到Origin
-        self.tab_tensile.v_tensile_src.trace_add('write', self.sync_data_source)
+        标签页已创建时直接返回；标签页模块在此时才导入。
         
-        self.create_status_bar()
+        Args:
+            index: 标签页序号
+        """
+        attr, module_name, class_name, _ = TAB_SPECS[index]
+        if getattr(self, attr) is not None:
+            return
+        frame_cls = getattr(importlib.import_module(module_name), class_name)
+        frame = frame_cls(self._tab_holders[index])
+        frame.pack(fill="both", expand=True)
+        setattr(self, attr, frame)
+
+        if attr == 'tab_tensile':
+            # 数据源同步：拉伸报告数据变化时同步到Origin
+            frame.v_tensile_src.trace_add('write', self.sync_data_source)
+        elif attr == 'tab_origin' and self.tab_tensile is not None:
+            self._do_sync()
+
+    def _on_tab_changed(self, event: tk.Event) -> None:
+        """
+        标签页切换回调
+        
+        首次切换到某个标签页时创建其内容；主题切换后首次显示时按新主题重建。
+        
+        Args:
+            event: <<NotebookTabChanged>>事件对象
+        """
+        index = self.notebook.index('current')
+        self.build_tab(index)
+        if index in self._stale_tabs:
+            self._stale_tabs.discard(index)
+            getattr(self, TAB_SPECS[index][0]).setup_ui()
 
     def configure_styles(self) -> None:
         """
         配置ttk样式
         
-        设置标签页的外观样式，包括背景色、前景色和字体。
+        设置标签页、标题栏和状态栏的外观样式，包括背景色、前景色和字体。
         """
         style = ttk.Style()
         style.theme_use('clam')
@@ -154,39 +212,60 @@ class MainApp:
                  background=[('selected', COLORS['bg_light'])],
                  foreground=[('selected', COLORS['accent'])])
 
+        # 标题栏和状态栏（切换主题时只需重新配置样式，控件本身不变）
+        bg_medium = COLORS['bg_medium']
+        style.configure('Tech.Header.TFrame', background=bg_medium)
+        style.configure('Tech.Status.TFrame', background=bg_medium)
+        style.configure('Tech.Icon.TLabel', background=bg_medium, foreground=COLORS['accent'],
+                       font=('Segoe UI Emoji', 28))
+        style.configure('Tech.Title.TLabel', background=bg_medium, foreground=COLORS['text'],
+                       font=('微软雅黑', 18, 'bold'))
+        style.configure('Tech.Status.TLabel', background=bg_medium, foreground=COLORS['success'],
+                       font=('微软雅黑', 9))
+        style.configure('Tech.Theme.TButton', background=COLORS['bg_light'], foreground=COLORS['text'],
+                       relief='flat', borderwidth=0, font=('微软雅黑', 9))
+        style.map('Tech.Theme.TButton',
+                 background=[('active', COLORS['border'])])
+
     def create_header(self) -> None:
         """
         创建标题栏
         
         包含应用程序图标、标题和主题切换按钮。
         """
-        header = tk.Frame(self.root, bg=COLORS['bg_medium'], height=70)
+        header = ttk.Frame(self.root, style='Tech.Header.TFrame', height=70)
         header.pack(fill='x', padx=15, pady=15)
         header.pack_propagate(False)
         
         # 左侧标题区域
-        title_frame = tk.Frame(header, bg=COLORS['bg_medium'])
+        title_frame = ttk.Frame(header, style='Tech.Header.TFrame')
         title_frame.pack(side='left', padx=20, pady=10)
         
-        tk.Label(title_frame, text="🔬", font=('Segoe UI Emoji', 28),
-                bg=COLORS['bg_medium'], fg=COLORS['accent']).pack(side='left')
+        ttk.Label(title_frame, text="🔬", style='Tech.Icon.TLabel').pack(side='left')
         
-        text_frame = tk.Frame(title_frame, bg=COLORS['bg_medium'])
+        text_frame = ttk.Frame(title_frame, style='Tech.Header.TFrame')
         text_frame.pack(side='left', padx=15)
         
-        tk.Label(text_frame, text="试验报告助手", font=('微软雅黑', 18, 'bold'),
-                bg=COLORS['bg_medium'], fg=COLORS['text']).pack(anchor='w')
+        ttk.Label(text_frame, text="试验报告助手", style='Tech.Title.TLabel').pack(anchor='w')
         
         # 右侧控制区域
-        right_frame = tk.Frame(header, bg=COLORS['bg_medium'])
+        right_frame = ttk.Frame(header, style='Tech.Header.TFrame')
         right_frame.pack(side='right', padx=20)
 
+        self.btn_theme = ttk.Button(right_frame, text=self._theme_button_text(),
+                                    command=self.toggle_theme,
+                                    style='Tech.Theme.TButton', cursor='hand2')
+        self.btn_theme.pack(side='left', padx=15)
+
+    def _theme_button_text(self) -> str:
+        """
+        获取主题切换按钮的文字
+        
+        Returns:
+            str: 带图标的按钮文字
+        """
         icon = "🌞" if self.current_theme == 'dark' else "🌙"
-        btn_theme = tk.Button(right_frame, text=icon + " 切换主题", 
-                             command=self.toggle_theme,
-                             bg=COLORS['bg_light'], fg=COLORS['text'],
-                             relief='flat', cursor='hand2', font=('微软雅黑', 9))
-        btn_theme.pack(side='left', padx=15)
+        return icon + " 切换主题"
         
     def create_status_bar(self) -> None:
         """
@@ -194,34 +273,68 @@ class MainApp:
         
         显示系统状态和Origin连接状态。
         """
-        status = tk.Frame(self.root, bg=COLORS['bg_medium'], height=35)
+        status = ttk.Frame(self.root, style='Tech.Status.TFrame', height=35)
         status.pack(fill='x', side='bottom', padx=15, pady=(0, 15))
         status.pack_propagate(False)
-        tk.Label(status, text="● 系统就绪 | Origin Link: ON", font=('微软雅黑', 9),
-                bg=COLORS['bg_medium'], fg=COLORS['success']).pack(side='left', padx=15)
+        ttk.Label(status, text="● 系统就绪 | Origin Link: ON",
+                  style='Tech.Status.TLabel').pack(side='left', padx=15)
 
     def toggle_theme(self) -> None:
         """
         切换主题
         
-        在亮色和暗色主题之间切换，并重建UI以应用新主题。
+        在亮色和暗色主题之间切换。主窗口、标签页容器和各标签页对象保持不变：
+        标题栏、状态栏和标签页容器通过重新配置ttk样式更新，各标签页只重建自身内容。
         """
         self.current_theme = 'light' if self.current_theme == 'dark' else 'dark'
         update_theme_colors(self.current_theme)
-        self.setup_ui()
+
+        self.root.configure(bg=COLORS['bg_dark'])
+        self.configure_styles()
+        self.btn_theme.configure(text=self._theme_button_text())
+
+        # 只重建当前显示的标签页；其余已创建的页标记为待重建，切换到该页时再重建，
+        # 尚未创建的页在首次显示时直接使用新主题
+        current = self.notebook.index('current')
+        for index, (attr, *_) in enumerate(TAB_SPECS):
+            tab = getattr(self, attr)
+            if tab is None:
+                continue
+            if index == current:
+                tab.setup_ui()
+            else:
+                self._stale_tabs.add(index)
     
     def sync_data_source(self, *args) -> None:
         """
         同步数据源
         
         当拉伸报告数据源变化时，自动同步到Origin绘图模块。
+        手动输入路径时每次按键都会触发，延迟到输入停顿后只同步最后一次的值。
         
         Args:
             *args: trace_add回调参数（未使用）
         """
+        if self._sync_after_id is not None:
+            self.root.after_cancel(self._sync_after_id)
+        self._sync_after_id = self.root.after(SYNC_DELAY_MS, self._do_sync)
+
+    def _do_sync(self) -> None:
+        """
+        执行数据源同步
+        
+        由sync_data_source延迟调度，将当前拉伸数据源同步到Origin绘图模块。
+        """
+        self._sync_after_id = None
+        # Origin页尚未创建时跳过，创建时会补做一次同步
+        if self.tab_origin is None:
+            return
         src = self.tab_tensile.v_tensile_src.get()
-        if src and (src.endswith('.xlsx') or src.endswith('.xls') or src.endswith('.csv')):
+        if src == self._last_origin_src:
+            return
+        if src and src.endswith(DATA_SOURCE_EXTS):
             self.tab_origin.set_data_source(src)
+            self._last_origin_src = src
 
 
 def main() -> None:
@@ -236,4 +349,6 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # 打包为exe后，硬度PDF解析使用的进程池子进程需要由此进入
+    multiprocessing.freeze_support()
     main()
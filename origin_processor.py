@@ -32,19 +32,33 @@ Copyright (c) 2024 育材堂. All rights reserved.
 
 import os
 import sys
+import numpy as np
 import pandas as pd
 import re
 from pptx import Presentation
 from pptx.util import Inches
 import time
+import shutil
+import tempfile
+from io import BytesIO
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 import win32com.client
 import pythoncom
 import win32gui
 import win32api
 import win32con
 import win32clipboard
+import win32event
 import ctypes
 
+# pyarrow为可选依赖，用于加速相变点CSV解析
+try:
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+
 # 延迟导入originpro，便于错误处理
 op = None
 
@@ -72,41 +86,121 @@ def init_origin():
             return False, f"连接Origin失败: {err_msg}\n\n可能原因:\n1. Origin版本过低(需要Origin 2019+)\n2. Origin未正确安装\n3. Origin未以管理员权限运行"
         return False, f"连接Origin时出错: {err_msg}"
 
-def find_data_sheet(file_path):
+# ============ Excel读取缓存 ============
+# 同一个Excel文件会被识别工作表、提取试样编号、读取曲线数据等多个步骤读取，
+# 按 (路径, 修改时间) 缓存解析结果，文件被修改后自动失效
+
+@lru_cache(maxsize=8)
+def _excel_file(file_path, mtime):
+    """打开Excel文件（按修改时间缓存）
+    
+    优先使用calamine引擎（原生代码解析，只读取单元格值，比openpyxl快得多），
+    未安装python-calamine或pandas版本不支持时回退到默认引擎。
+    文件内容先整体读入内存再解析，缓存的对象不持有文件句柄，
+    Excel仍可保存或替换该文件（修改时间变化后缓存自动失效）
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    try:
+        return pd.ExcelFile(BytesIO(data), engine='calamine')
+    except (ImportError, ValueError):
+        return pd.ExcelFile(BytesIO(data))
+
+@lru_cache(maxsize=16)
+def _sheet_df(file_path, mtime, sheet_name, header):
+    """读取单个工作表（按修改时间缓存）"""
+    return pd.read_excel(_excel_file(file_path, mtime), sheet_name=sheet_name, header=header)
+
+def _get_xls(file_path):
+    """获取已缓存的ExcelFile对象"""
+    return _excel_file(file_path, os.path.getmtime(file_path))
+
+def _read_sheet(file_path, sheet_name=0, header=0):
+    """读取工作表，返回缓存DataFrame的浅拷贝（调用方修改列名不影响缓存）"""
+    df = _sheet_df(file_path, os.path.getmtime(file_path), sheet_name, header)
+    return df.copy(deep=False)
+
+# 说明/目录类工作表，不含数据，识别时直接跳过
+_NON_DATA_SHEET_RE = re.compile(r'README|说明|目录', re.IGNORECASE)
+
+def _read_header(xls, sheet_name):
+    """只读取工作表的表头行，返回列名"""
+    return pd.read_excel(xls, sheet_name=sheet_name, nrows=0).columns
+
+def _read_column(xls, sheet_name, pos):
+    """只读取工作表中第pos列（从0开始）的数据"""
+    return pd.read_excel(xls, sheet_name=sheet_name, usecols=[pos]).iloc[:, 0]
+
+def find_data_sheet(file_path, xls=None):
     """
     自动识别数据所在的工作表
     - 包含"曲线数据"或"应变"/"应力"的为绘图表
     - 包含"试样编号"的为汇总表（提取试样编号列表）
-    返回: (sheet_name, sample_ids) 
+    xls: 已打开的ExcelFile，省略时从缓存获取
+    返回: (sheet_name, sample_ids, data_df) data_df 为已读取的绘图表数据，未识别到时为None
     """
     if file_path.endswith('.csv'):
-        return None, None
+        return None, None, None
     
-    xls = pd.ExcelFile(file_path)
-    data_sheet = None
+    if xls is None:
+        xls = _get_xls(file_path)
     sample_ids = []
     
+    # 优先识别曲线数据表：名称包含"曲线"的直接选中，只比较名称不读取数据
+    data_sheet = next((s for s in xls.sheet_names if '曲线' in s), None)
+    
     for sheet_name in xls.sheet_names:
-        df = pd.read_excel(xls, sheet_name=sheet_name)
-        
-        # 优先识别曲线数据表（名称包含"曲线"或列名包含"应变"/"应力"）
-        if '曲线' in sheet_name:
-            data_sheet = sheet_name
+        # 绘图表和试样编号都已找到，不再读取后面的工作表
+        if data_sheet and sample_ids:
+            break
+        if sheet_name == data_sheet or _NON_DATA_SHEET_RE.search(sheet_name):
             continue
         
+        # 只读取表头行判断列名，不读取数据
+        columns = _read_header(xls, sheet_name)
+        
         # 检查列名是否包含应变/应力
-        col_str = ' '.join(str(c) for c in df.columns)
-        if '应变' in col_str or '应力' in col_str:
-            data_sheet = sheet_name
+        if columns.astype(str).str.contains('应变|应力').any():
+            if data_sheet is None:
+                data_sheet = sheet_name
             continue
         
-        # 检查是否包含"试样编号"列（汇总表，提取试样编号列表）
-        for col in df.columns:
+        # 检查是否包含"试样编号"列（汇总表，只读取该列提取试样编号列表）
+        for pos, col in enumerate(columns):
             if '试样编号' in str(col):
-                sample_ids = [str(v) for v in df[col] if pd.notna(v)]
+                sample_ids = [str(v) for v in _read_column(xls, sheet_name, pos) if pd.notna(v)]
                 break
     
-    return data_sheet, sample_ids
+    data_df = _read_sheet(file_path, data_sheet) if data_sheet else None
+    return data_sheet, sample_ids, data_df
+
+def swap_xy_columns(df):
+    """交换每对XY列的顺序（按位置重排），列数为奇数时最后一列保持不动"""
+    n = df.shape[1]
+    paired = n - n % 2
+    perm = np.arange(n)
+    perm[:paired] = perm[:paired].reshape(-1, 2)[:, ::-1].ravel()
+    return df.iloc[:, perm]
+
+def set_y_column_names(df, sample_ids):
+    """将试样编号依次设置为Y列（第2、4、6...列）的列名，多余的编号忽略"""
+    names = df.columns.to_numpy(dtype=object).copy()
+    k = min(len(sample_ids), len(names) // 2)
+    names[1:2 * k:2] = sample_ids[:k]
+    return df.set_axis(names, axis=1)
+
+def set_xy_column_types(wks, num_cols):
+    """将工作表的列类型设置为XYXY...
+    
+    优先通过originpro的cols_axis属性一次设置；旧版originpro不支持时，
+    合并为一条LabTalk命令执行（X=4, Y=1）
+    """
+    # 旧版没有该属性时直接赋值不会报错（只会新建实例属性），因此在类上检查是否为property
+    if isinstance(getattr(type(wks), 'cols_axis', None), property):
+        wks.cols_axis = ''.join('x' if i % 2 == 0 else 'y' for i in range(num_cols))
+    else:
+        cmd = ''.join(f'wks.col{i + 1}.type={4 if i % 2 == 0 else 1};' for i in range(num_cols))
+        op.lt_exec(cmd)
 
 def plot_in_origin(file_path, template_path=None, lines_per_graph=1, swap_xy=False):
     """
@@ -132,38 +226,25 @@ def plot_in_origin(file_path, template_path=None, lines_per_graph=1, swap_xy=Fal
     print(f"导入数据: {os.path.basename(file_path)}")
     
     # --- 3. 自动识别工作表 ---
-    data_sheet, sample_ids = find_data_sheet(file_path)
+    data_sheet, sample_ids, df = find_data_sheet(file_path)
     
     # --- 4. 导入数据 ---
     try:
         if data_sheet:
             print(f"识别到数据表: {data_sheet}")
-            df = pd.read_excel(file_path, sheet_name=data_sheet)
         elif file_path.endswith('.csv'):
             df = pd.read_csv(file_path)
         else:
-            df = pd.read_excel(file_path)
+            df = _read_sheet(file_path)
         
         # 如果需要交换XY列（在内存中，不修改原文件）
         if swap_xy:
-            cols = list(df.columns)
-            new_cols = []
-            for i in range(0, len(cols) - 1, 2):
-                new_cols.append(cols[i + 1])
-                new_cols.append(cols[i])
-            if len(cols) % 2 == 1:
-                new_cols.append(cols[-1])
-            df = df[new_cols]
+            df = swap_xy_columns(df)
             print(f"已交换XY列顺序")
         
         # 将试样编号设置为Y列的列名
         if sample_ids:
-            cols = list(df.columns)
-            for i, sid in enumerate(sample_ids):
-                y_col_idx = i * 2 + 1  # Y列索引: 1, 3, 5, 7...
-                if y_col_idx < len(cols):
-                    cols[y_col_idx] = sid
-            df.columns = cols
+            df = set_y_column_names(df, sample_ids)
             print(f"已将试样编号设置为Y列名: {sample_ids[:3]}...")
         
         wks.from_df(df)
@@ -217,16 +298,18 @@ def plot_in_origin(file_path, template_path=None, lines_per_graph=1, swap_xy=Fal
     return f"成功！\n数据模式: XYXY\n已创建 {len(created_graphs)} 张图表。\n请切换到 Origin 查看。"
 
 
-def get_sample_ids_from_excel(file_path, data_type='tensile'):
-    """从Excel提取试样编号列表"""
-    xls = pd.ExcelFile(file_path)
+def get_sample_ids_from_excel(file_path, data_type='tensile', xls=None):
+    """从Excel提取试样编号列表（xls为已打开的ExcelFile，省略时从缓存获取）"""
+    if xls is None:
+        xls = _get_xls(file_path)
     sample_ids = []
     
     for sheet_name in xls.sheet_names:
-        df = pd.read_excel(xls, sheet_name=sheet_name)
-        for col in df.columns:
+        if _NON_DATA_SHEET_RE.search(sheet_name):
+            continue
+        for pos, col in enumerate(_read_header(xls, sheet_name)):
             if '试样编号' in str(col):
-                sample_ids = [str(v) for v in df[col] if pd.notna(v) and str(v).strip()]
+                sample_ids = [str(v) for v in _read_column(xls, sheet_name, pos) if pd.notna(v) and str(v).strip()]
                 if sample_ids:
                     return sample_ids
     return sample_ids
@@ -239,41 +322,132 @@ def export_graph_to_image(graph, output_path):
         emf_path = output_path.replace('.png', '.emf')
         graph.save_fig(emf_path)
         return emf_path if os.path.exists(emf_path) else None
-    except:
+    except Exception:
         # 备选PNG
         try:
             graph.save_fig(output_path, width=800)
             return output_path if os.path.exists(output_path) else None
-        except:
+        except Exception:
             return None
 
 
-def copy_graph_to_ppt_ole(gname, prs, slide_idx, width_pt=340, height_pt=280, right_side=True):
-    """使用Ctrl+J复制Origin图形为OLE对象到PPT指定页面"""
-    import win32gui
-    import win32api
-    import win32con
-    import win32clipboard
-    import ctypes
-    
-    def get_clipboard_seq():
-        """获取剪贴板序列号"""
+# ============ 剪贴板工具 ============
+WM_CLIPBOARDUPDATE = 0x031D
+
+# 仅接收消息的隐藏窗口，注册为剪贴板监听者，剪贴板变化时收到WM_CLIPBOARDUPDATE
+_clipboard_hwnd = None
+
+def get_clipboard_seq():
+    """获取剪贴板序列号"""
+    try:
+        return ctypes.windll.user32.GetClipboardSequenceNumber()
+    except Exception:
+        return 0
+
+def empty_clipboard(retries=20, interval=0.01):
+    """清空剪贴板；剪贴板被其他程序短暂占用时重试打开"""
+    for _ in range(retries):
         try:
-            return ctypes.windll.user32.GetClipboardSequenceNumber()
-        except:
-            return 0
-    
-    def find_origin_window():
-        result = []
-        def callback(hwnd, _):
-            if win32gui.IsWindowVisible(hwnd):
-                title = win32gui.GetWindowText(hwnd)
-                if 'Origin' in title:
-                    result.append(hwnd)
-            return True
-        win32gui.EnumWindows(callback, None)
-        return result[0] if result else None
+            win32clipboard.OpenClipboard()
+        except Exception:
+            time.sleep(interval)
+            continue
+        try:
+            win32clipboard.EmptyClipboard()
+        except Exception:
+            pass
+        finally:
+            win32clipboard.CloseClipboard()
+        return True
+    return False
+
+def _get_clipboard_listener():
+    """创建（仅一次）剪贴板监听窗口"""
+    global _clipboard_hwnd
+    if _clipboard_hwnd is None:
+        hwnd = win32gui.CreateWindowEx(0, "STATIC", "clipboard-listener", 0, 0, 0, 0, 0,
+                                       win32con.HWND_MESSAGE, 0, 0, None)
+        ctypes.windll.user32.AddClipboardFormatListener(hwnd)
+        _clipboard_hwnd = hwnd
+    return _clipboard_hwnd
+
+def _clipboard_free():
+    """剪贴板当前没有被其他程序打开时返回True"""
+    try:
+        win32clipboard.OpenClipboard()
+    except Exception:
+        return False
+    win32clipboard.CloseClipboard()
+    return True
+
+def _drain_clipboard_updates(hwnd):
+    """取走监听窗口已收到的WM_CLIPBOARDUPDATE消息（不分发其他窗口的消息），返回是否收到过"""
+    received = False
+    while win32gui.PeekMessage(hwnd, WM_CLIPBOARDUPDATE, WM_CLIPBOARDUPDATE, win32con.PM_REMOVE)[0]:
+        received = True
+    return received
+
+def wait_clipboard_change(initial_seq, timeout=3.0):
+    """等待剪贴板内容更新并写入完成，返回是否在超时前完成
     
+    仅序列号变化时剪贴板可能仍被Origin打开写入，此时粘贴会失败。
+    系统在剪贴板所有者关闭剪贴板后才投递WM_CLIPBOARDUPDATE，因此以
+    "序列号已变化且收到该消息（或剪贴板已无人占用）"作为完成条件。
+    每次最多等待50ms后复查，监听窗口不可用时按短间隔轮询。
+    """
+    try:
+        hwnd = _get_clipboard_listener()
+    except Exception:
+        hwnd = None
+    # 丢弃调用前积压的消息（如清空剪贴板产生的通知），避免误判为本次更新
+    if hwnd:
+        _drain_clipboard_updates(hwnd)
+    
+    deadline = time.monotonic() + timeout
+    updated = False
+    while True:
+        if hwnd and _drain_clipboard_updates(hwnd):
+            updated = True
+        if get_clipboard_seq() != initial_seq and (updated or _clipboard_free()):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        wait_ms = int(min(remaining, 0.05) * 1000)
+        if hwnd:
+            win32event.MsgWaitForMultipleObjects([], False, wait_ms, win32event.QS_POSTMESSAGE)
+        else:
+            time.sleep(wait_ms / 1000)
+
+
+# ============ Origin窗口 ============
+# 上次找到的Origin主窗口句柄，复制多张图时复用
+_origin_hwnd = None
+
+def find_origin_window():
+    """枚举顶层窗口，查找标题包含Origin的可见窗口"""
+    result = []
+    def callback(hwnd, _):
+        if win32gui.IsWindowVisible(hwnd):
+            title = win32gui.GetWindowText(hwnd)
+            if 'Origin' in title:
+                result.append(hwnd)
+        return True
+    win32gui.EnumWindows(callback, None)
+    return result[0] if result else None
+
+def get_origin_hwnd():
+    """获取Origin窗口句柄：缓存的句柄仍有效时直接返回，否则重新枚举窗口"""
+    global _origin_hwnd
+    hwnd = _origin_hwnd
+    if hwnd and win32gui.IsWindow(hwnd) and 'Origin' in win32gui.GetWindowText(hwnd):
+        return hwnd
+    _origin_hwnd = find_origin_window()
+    return _origin_hwnd
+
+
+def copy_graph_to_ppt_ole(gname, prs, slide_idx, width_pt=340, height_pt=280, right_side=True):
+    """使用Ctrl+J复制Origin图形为OLE对象到PPT指定页面"""
     def force_origin_foreground(origin_hwnd):
         """强制Origin窗口置于前台"""
         if origin_hwnd:
@@ -283,7 +457,7 @@ def copy_graph_to_ppt_ole(gname, prs, slide_idx, width_pt=340, height_pt=280, ri
                     win32gui.ShowWindow(origin_hwnd, win32con.SW_RESTORE)
                 win32gui.SetForegroundWindow(origin_hwnd)
                 ctypes.windll.user32.SetFocus(origin_hwnd)
-            except: pass
+            except Exception: pass
     
     def do_ctrl_j():
         """执行Ctrl+J"""
@@ -294,14 +468,9 @@ def copy_graph_to_ppt_ole(gname, prs, slide_idx, width_pt=340, height_pt=280, ri
         win32api.keybd_event(ord('J'), 0, win32con.KEYEVENTF_KEYUP, 0)
         time.sleep(0.1)
         win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-        time.sleep(2.5)
     
     # 清空剪贴板
-    try:
-        win32clipboard.OpenClipboard()
-        win32clipboard.EmptyClipboard()
-        win32clipboard.CloseClipboard()
-    except: pass
+    empty_clipboard()
     
     # 记录初始剪贴板序列号
     initial_seq = get_clipboard_seq()
@@ -310,44 +479,49 @@ def copy_graph_to_ppt_ole(gname, prs, slide_idx, width_pt=340, height_pt=280, ri
     op.lt_exec(f'win -a {gname};')
     time.sleep(0.5)
     
-    origin_hwnd = find_origin_window()
+    origin_hwnd = get_origin_hwnd()
     force_origin_foreground(origin_hwnd)
     time.sleep(0.8)
     
-    # Ctrl+J 复制为OLE对象
+    # Ctrl+J 复制为OLE对象，等待剪贴板更新
     do_ctrl_j()
+    copied = wait_clipboard_change(initial_seq)
     
-    # 检查剪贴板是否有变化，如果没有则重试
-    new_seq = get_clipboard_seq()
+    # 剪贴板在超时内没有变化则重试
     retry_count = 0
-    while new_seq == initial_seq and retry_count < 3:
+    while not copied and retry_count < 3:
         print(f"[OLE] 剪贴板未变化，重试第{retry_count+1}次...")
         force_origin_foreground(origin_hwnd)
         time.sleep(0.5)
         do_ctrl_j()
-        new_seq = get_clipboard_seq()
+        copied = wait_clipboard_change(initial_seq)
         retry_count += 1
     
     # 粘贴到PPT
     slide = prs.Slides(slide_idx)
     initial_count = slide.Shapes.Count
-    try:
-        slide.Shapes.Paste()
-        time.sleep(0.5)
-    except Exception as e:
-        print(f"[OLE] 粘贴失败: {e}")
-        return False
+    # Shapes.Paste 为同步调用，返回时形状已插入；剪贴板仍被短暂占用时稍后重试
+    for attempt in range(3):
+        try:
+            slide.Shapes.Paste()
+            break
+        except Exception as e:
+            if attempt == 2:
+                print(f"[OLE] 粘贴失败: {e}")
+                return False
+            time.sleep(0.2)
     
     # 检查是否粘贴成功，如果没有则重试
     if slide.Shapes.Count == initial_count:
         print("[OLE] 粘贴后形状数未增加，重试...")
         force_origin_foreground(origin_hwnd)
         time.sleep(0.5)
+        seq = get_clipboard_seq()
         do_ctrl_j()
+        wait_clipboard_change(seq)
         try:
             slide.Shapes.Paste()
-            time.sleep(0.5)
-        except: pass
+        except Exception: pass
     
     # 调整位置和大小
     if slide.Shapes.Count > initial_count:
@@ -369,54 +543,119 @@ def copy_graph_to_ppt_ole(gname, prs, slide_idx, width_pt=340, height_pt=280, ri
     return True
 
 
-def create_ppt_with_origin_graphs(graph_names, output_ppt_path, folder=None):
-    """导出Origin图形为PNG并创建PPT（备用方案）"""
-    if folder is None:
-        folder = os.path.dirname(output_ppt_path)
+# PowerPoint空白版式（ppLayoutBlank）
+PP_LAYOUT_BLANK = 12
+
+# PowerPoint应用实例，多次导出之间复用
+_ppt_app = None
+
+def get_ppt_app():
+    """获取PowerPoint应用实例
     
-    image_paths = []
-    for i, gname in enumerate(graph_names):
-        img_path = os.path.join(folder, f"temp_graph_{i}.png")
-        emf_path = os.path.join(folder, f"temp_graph_{i}.emf")
+    首次调用时初始化COM并启动/连接PowerPoint，之后复用同一实例；
+    用户关闭PowerPoint导致实例失效时自动重新连接。
+    使用gencache.EnsureDispatch生成并缓存类型库包装，属性和方法直接按DISPID调用。
+    """
+    global _ppt_app
+    if _ppt_app is not None:
         try:
-            graph = op.find_graph(gname)
-            if graph:
-                print(f"正在导出图形 {i+1}/{len(graph_names)}: {gname}")
-                graph.activate()
-                time.sleep(0.3)
-                
-                try:
-                    graph.save_fig(emf_path)
-                    time.sleep(0.3)
-                    if os.path.exists(emf_path):
-                        image_paths.append(emf_path)
-                        continue
-                except: pass
-                
-                try:
-                    graph.save_fig(img_path, width=1200)
-                    time.sleep(0.3)
-                    if os.path.exists(img_path):
-                        image_paths.append(img_path)
-                except: pass
-                    
+            _ppt_app.Visible = True
+            return _ppt_app
+        except Exception:
+            _ppt_app = None
+    
+    pythoncom.CoInitialize()
+    try:
+        app = win32com.client.gencache.EnsureDispatch("PowerPoint.Application")
+    except Exception:
+        # 类型库缓存损坏或无法生成时退回动态调度
+        app = win32com.client.Dispatch("PowerPoint.Application")
+    app.Visible = True
+    _ppt_app = app
+    return app
+
+
+def export_graphs_emf(graph_names, emf_paths):
+    """一次LabTalk调用批量导出EMF，返回实际生成的文件路径（未生成为None）"""
+    script = ''.join(
+        f'win -a {gname};expGraph type:=emf path:="{os.path.dirname(p)}" '
+        f'filename:="{os.path.splitext(os.path.basename(p))[0]}" overwrite:=replace;'
+        for gname, p in zip(graph_names, emf_paths))
+    try:
+        op.lt_exec(script)
+    except Exception as e:
+        print(f"批量导出EMF失败: {e}")
+    # 每个目录只列一次文件，不逐个stat（网络共享目录上stat很慢）
+    existing = set()
+    for d in {os.path.dirname(p) for p in emf_paths}:
+        existing.update(os.path.join(d, name) for name in os.listdir(d or os.curdir))
+    return [p if p in existing else None for p in emf_paths]
+
+
+def export_graph_images(graphs, folder, prefix):
+    """将图形导出为图片，返回成功导出的 [(图形名, 图片路径)]
+    
+    先一次LabTalk调用批量导出EMF；本批中未生成EMF的图形逐张导出PNG。
+    是否回退只按本批结果判断，不影响之后的导出。
+    """
+    graph_names = list(graphs)
+    emf_paths = [os.path.join(folder, f"{prefix}_{i}.emf") for i in range(len(graph_names))]
+    exported = export_graphs_emf(graph_names, emf_paths)
+    results = []
+    for i, (gname, emf_path) in enumerate(zip(graph_names, exported)):
+        if emf_path:
+            results.append((gname, emf_path))
+            continue
+        img_path = os.path.join(folder, f"{prefix}_{i}.png")
+        try:
+            graphs[gname].save_fig(img_path, width=1200)
+            if os.path.exists(img_path):
+                results.append((gname, img_path))
         except Exception as e:
             print(f"导出图形 {gname} 失败: {e}")
+    return results
+
+
+def create_ppt_with_origin_graphs(graph_names, output_ppt_path, folder=None):
+    """导出Origin图形为PNG并创建PPT（备用方案）
+    
+    folder: 临时图片目录，默认使用本地临时目录（输出目录可能是较慢的网络共享）
+    """
+    temp_dir = folder is None
+    if temp_dir:
+        folder = tempfile.mkdtemp(prefix='origin_ppt_')
+    
+    # 按名称查找图形对象，不存在的跳过
+    graphs = {gname: op.find_graph(gname) for gname in graph_names}
+    graphs = {gname: graph for gname, graph in graphs.items() if graph}
+    print(f"正在导出 {len(graphs)} 张图形...")
+    image_paths = [path for _, path in export_graph_images(graphs, folder, "temp_graph")]
     
     if image_paths:
         create_ppt_from_images(image_paths, output_ppt_path)
+    if temp_dir:
+        shutil.rmtree(folder, ignore_errors=True)
+    else:
         for p in image_paths:
             try: os.remove(p)
-            except: pass
-        return output_ppt_path
-    return None
+            except OSError: pass
+    return output_ppt_path if image_paths else None
 
 
-def create_ppt_from_images(image_paths, output_ppt_path, origin_project_path=None):
-    """将图片列表创建为PPT，每页一张图（备用方案）"""
+@lru_cache(maxsize=1)
+def _blank_pptx_bytes():
+    """16:9空白演示文稿的文件内容，只生成一次，避免每次重新解析python-pptx默认模板"""
     prs = Presentation()
     prs.slide_width = Inches(13.333)
     prs.slide_height = Inches(7.5)
+    buf = BytesIO()
+    prs.save(buf)
+    return buf.getvalue()
+
+
+def create_ppt_from_images(image_paths, output_ppt_path, origin_project_path=None):
+    """将图片列表创建为PPT，每页一张图（备用方案）"""
+    prs = Presentation(BytesIO(_blank_pptx_bytes()))
     
     # 使用最后一个布局（通常是空白）
     blank_layout = prs.slide_layouts[len(prs.slide_layouts) - 1]
@@ -436,30 +675,30 @@ def save_origin_project(output_path):
     try:
         op.save(output_path)
         return True
-    except:
+    except Exception:
         return False
 
 
 def append_origin_graphs_to_ppt(graph_names, ppt_path, folder=None):
-    """将Origin图形作为EMF图片添加到已有PPT文件末尾"""
-    if folder is None:
-        folder = os.path.dirname(ppt_path)
+    """将Origin图形作为EMF图片（未生成时为PNG）添加到已有PPT文件末尾（folder同create_ppt_with_origin_graphs）"""
+    temp_dir = folder is None
+    if temp_dir:
+        folder = tempfile.mkdtemp(prefix='origin_ppt_')
     
+    image_paths = []
     try:
         prs = Presentation(ppt_path)
         blank_layout = prs.slide_layouts[len(prs.slide_layouts) - 1]
         
-        for i, gname in enumerate(graph_names):
-            img_path = os.path.join(folder, f"temp_append_{i}.emf")
+        graphs = {gname: op.find_graph(gname) for gname in graph_names}
+        graphs = {gname: graph for gname, graph in graphs.items() if graph}
+        images = export_graph_images(graphs, folder, "temp_append")
+        image_paths = [path for _, path in images]
+        for gname, img_path in images:
             try:
-                graph = op.find_graph(gname)
-                if graph:
-                    graph.save_fig(img_path)
-                    if os.path.exists(img_path):
-                        slide = prs.slides.add_slide(blank_layout)
-                        slide.shapes.add_picture(img_path, Inches(0.5), Inches(0.5), 
-                                                width=Inches(12.333), height=Inches(6.5))
-                        os.remove(img_path)
+                slide = prs.slides.add_slide(blank_layout)
+                slide.shapes.add_picture(img_path, Inches(0.5), Inches(0.5), 
+                                        width=Inches(12.333), height=Inches(6.5))
             except Exception as e:
                 print(f"添加图形 {gname} 失败: {e}")
         
@@ -468,107 +707,111 @@ def append_origin_graphs_to_ppt(graph_names, ppt_path, folder=None):
     except Exception as e:
         print(f"添加图形到PPT失败: {e}")
         return None
+    finally:
+        # 全部添加完成后统一清理临时图片
+        if temp_dir:
+            shutil.rmtree(folder, ignore_errors=True)
+        else:
+            for p in image_paths:
+                try: os.remove(p)
+                except OSError: pass
 
 
-def get_tensile_sample_ids(file_path):
-    """从拉伸报告Excel提取试样编号列表（处理特殊格式）"""
-    xls = pd.ExcelFile(file_path)
-    sample_ids = []
-    
-    for sheet_name in xls.sheet_names:
-        # 读取整个sheet，不设置header
-        df_raw = pd.read_excel(xls, sheet_name=sheet_name, header=None)
-        
-        # 遍历每一行，找到包含"试样编号"的行
-        for row_idx in range(min(10, len(df_raw))):  # 只检查前10行
-            row_values = [str(v) for v in df_raw.iloc[row_idx] if pd.notna(v)]
-            if any('试样编号' in v for v in row_values):
-                # 找到试样编号所在的列
-                for col_idx, val in enumerate(df_raw.iloc[row_idx]):
-                    if pd.notna(val) and '试样编号' in str(val):
+def _scan_tensile_ids_xlsx(file_path):
+    """流式读取xlsx：每个工作表只扫描前10行找"试样编号"，再只读取该列"""
+    import openpyxl
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            header_rows = ws.iter_rows(max_row=10, values_only=True)
+            for row_idx, row in enumerate(header_rows, start=1):
+                for col_idx, val in enumerate(row, start=1):
+                    if val is not None and '试样编号' in str(val):
                         # 提取该列下面的所有非空值
-                        sample_ids = [str(v) for v in df_raw.iloc[row_idx+1:, col_idx] 
-                                     if pd.notna(v) and str(v).strip()]
+                        column = ws.iter_rows(min_row=row_idx + 1, min_col=col_idx, max_col=col_idx, values_only=True)
+                        sample_ids = [str(v) for (v,) in column if v is not None and str(v).strip()]
                         if sample_ids:
-                            print(f"从第{row_idx+1}行找到试样编号列，提取到{len(sample_ids)}个编号")
+                            print(f"从第{row_idx}行找到试样编号列，提取到{len(sample_ids)}个编号")
                             return sample_ids
+        return []
+    finally:
+        wb.close()
+
+
+def get_tensile_sample_ids(file_path, xls=None):
+    """从拉伸报告Excel提取试样编号列表（处理特殊格式，xls为已打开的ExcelFile）"""
+    if file_path.lower().endswith(('.xlsx', '.xlsm')):
+        return _scan_tensile_ids_xlsx(file_path)
+    
+    # .xls等openpyxl不支持的格式：每个工作表只读取前10行查找，再只读取该列
+    if xls is None:
+        xls = _get_xls(file_path)
+    sample_ids = []
+    
+    for sheet_name in xls.sheet_names:
+        # 在前10行中一次性查找包含"试样编号"的单元格（按行、列顺序）
+        head = pd.read_excel(xls, sheet_name=sheet_name, header=None, nrows=10)
+        mask = head.notna() & head.astype(str).apply(lambda s: s.str.contains('试样编号', regex=False))
+        for row_idx, col_idx in np.argwhere(mask.to_numpy()):
+            # 提取该列下面的所有非空值
+            column = pd.read_excel(xls, sheet_name=sheet_name, header=None, skiprows=row_idx + 1,
+                                   usecols=[col_idx]).iloc[:, 0].dropna().astype(str)
+            sample_ids = column[column.str.strip() != ''].tolist()
+            if sample_ids:
+                print(f"从第{row_idx+1}行找到试样编号列，提取到{len(sample_ids)}个编号")
+                return sample_ids
     return sample_ids
 
 
-def plot_tensile_to_ppt(file_path, template_path=None, lines_per_graph=12, swap_xy=True, append_to_ppt=None, width_cm=15.0, height_cm=12.0, copy_to_ppt=True):
-    """拉伸报告Origin绘图，可选是否导出到PPT
+def _plot_xyxy(file_path, df, sample_ids, tag, prefix, template_path=None, lines_per_graph=12,
+               width_cm=15.0, height_cm=12.0, copy_to_ppt=True, append_to_ppt=None, right_side=False):
+    """拉伸/VDA共用的XYXY绘图流程：导入数据、分组绘图，可选复制到PPT
     
     参数:
-        copy_to_ppt: 是否复制图形到PPT，默认True。如果为False，只在Origin中绘图。
+        df: 曲线数据，每两列为一组XY（交换为XY顺序后导入）
+        sample_ids: 试样编号，依次设置为Y列名
+        tag: 图形名中的类型字母（拉伸为T，VDA为V）
+        prefix: 输出的PPT/Origin项目文件名前缀
+        append_to_ppt: 已存在的PPT路径，图形依次添加到各页右侧
+        right_side: 新建PPT时图形是否放在页面右侧
     """
-    import win32com.client
-    import pythoncom
-    
-    try:
-        if op.oext:
-            op.set_show(True)
-    except: pass
-    
-    sample_ids = get_tensile_sample_ids(file_path)
-    print(f"提取到试样编号: {sample_ids}")
-    
-    xls = pd.ExcelFile(file_path)
-    df = None
-    for sheet in xls.sheet_names:
-        if '曲线' in sheet:
-            df = pd.read_excel(xls, sheet_name=sheet)
-            break
-    if df is None:
-        df = pd.read_excel(file_path)
-    
-    cols = list(df.columns)
-    new_cols, reordered_cols = [], []
-    sample_idx = 0
-    for i in range(0, len(cols) - 1, 2):
-        reordered_cols.extend([cols[i + 1], cols[i]])
-        new_cols.append(cols[i + 1])
-        new_cols.append(sample_ids[sample_idx] if sample_idx < len(sample_ids) else cols[i])
-        sample_idx += 1
-    if len(cols) % 2 == 1:
-        reordered_cols.append(cols[-1])
-        new_cols.append(cols[-1])
-    
-    df = df[reordered_cols]
-    df.columns = new_cols
+    df = set_y_column_names(swap_xy_columns(df), sample_ids)
     
     wb = op.new_book()
     wks = wb[0]
     wks.from_df(df)
     
     num_cols = wks.cols
-    for col_idx in range(num_cols):
-        op.lt_exec(f'wks.col{col_idx + 1}.type = {4 if col_idx % 2 == 0 else 1};')
+    set_xy_column_types(wks, num_cols)
     
     y_cols = list(range(1, num_cols, 2))
     chunks = [y_cols[i:i + lines_per_graph] for i in range(0, len(y_cols), lines_per_graph)]
     
     folder = os.path.dirname(file_path)
     fname = os.path.splitext(os.path.basename(file_path))[0]
+    opju_path = os.path.join(folder, f"{prefix}_{fname}.opju")
+    
+    def plot_chunk(i, chunk):
+        """绘制第i组曲线，返回图形名"""
+        graph = op.new_graph(template=template_path) if template_path else op.new_graph()
+        layer = graph[0]
+        for y_idx in chunk:
+            layer.add_plot(wks, coly=y_idx, colx=y_idx - 1, type='line')
+        layer.rescale()
+        gname = f"{fname}_{tag}{i+1}"
+        graph.name = gname
+        return gname
     
     # 如果不需要复制到PPT，只在Origin中绘图
     if not copy_to_ppt:
-        created_graphs = []
         for i, chunk in enumerate(chunks):
-            graph = op.new_graph(template=template_path) if template_path else op.new_graph()
-            layer = graph[0]
-            for y_idx in chunk:
-                layer.add_plot(wks, coly=y_idx, colx=y_idx - 1, type='line')
-            layer.rescale()
-            gname = f"{fname}_T{i+1}"
-            graph.name = gname
-            created_graphs.append(gname)
+            plot_chunk(i, chunk)
             print(f"已完成第{i+1}/{len(chunks)}张图表")
         
         # 保存Origin项目
-        opju_path = os.path.join(folder, f"拉伸曲线_{fname}.opju")
         save_origin_project(opju_path)
         
-        return f"成功！已在Origin中创建 {len(created_graphs)} 张图表\nOrigin项目: {opju_path}"
+        return f"成功！已在Origin中创建 {len(chunks)} 张图表\nOrigin项目: {opju_path}"
     
     # 以下是复制到PPT的逻辑
     # cm转pt (1cm ≈ 28.35pt)
@@ -576,12 +819,9 @@ def plot_tensile_to_ppt(file_path, template_path=None, lines_per_graph=12, swap_
     height_pt = height_cm * 28.35
     
     # 初始化
-    pythoncom.CoInitialize()
     op.lt_exec('doc -s;')
-    time.sleep(0.3)
     
-    ppt_app = win32com.client.Dispatch("PowerPoint.Application")
-    ppt_app.Visible = True
+    ppt_app = get_ppt_app()
     
     # 如果有已存在的PPT，打开它并添加图形到每页右侧
     if append_to_ppt and os.path.exists(append_to_ppt):
@@ -589,200 +829,143 @@ def plot_tensile_to_ppt(file_path, template_path=None, lines_per_graph=12, swap_
         ppt_path = append_to_ppt
         
         for i, chunk in enumerate(chunks):
-            graph = op.new_graph(template=template_path) if template_path else op.new_graph()
-            layer = graph[0]
-            for y_idx in chunk:
-                layer.add_plot(wks, coly=y_idx, colx=y_idx - 1, type='line')
-            layer.rescale()
-            gname = f"{fname}_T{i+1}"
-            graph.name = gname
-            
+            gname = plot_chunk(i, chunk)
             slide_idx = i + 1
             if slide_idx <= prs.Slides.Count:
                 copy_graph_to_ppt_ole(gname, prs, slide_idx, width_pt=width_pt, height_pt=height_pt, right_side=True)
             print(f"已完成第{i+1}/{len(chunks)}张图表")
     else:
         prs = ppt_app.Presentations.Add()
-        ppt_path = os.path.join(folder, f"拉伸曲线_{fname}.pptx")
+        ppt_path = os.path.join(folder, f"{prefix}_{fname}.pptx")
         
+        # 边绘图边导出OLE
         for i, chunk in enumerate(chunks):
-            graph = op.new_graph(template=template_path) if template_path else op.new_graph()
-            layer = graph[0]
-            for y_idx in chunk:
-                layer.add_plot(wks, coly=y_idx, colx=y_idx - 1, type='line')
-            layer.rescale()
-            gname = f"{fname}_T{i+1}"
-            graph.name = gname
-            
-            prs.Slides.Add(prs.Slides.Count + 1, 12)
-            copy_graph_to_ppt_ole(gname, prs, prs.Slides.Count, width_pt=width_pt, height_pt=height_pt, right_side=False)
+            gname = plot_chunk(i, chunk)
+            prs.Slides.Add(prs.Slides.Count + 1, PP_LAYOUT_BLANK)
+            copy_graph_to_ppt_ole(gname, prs, prs.Slides.Count, width_pt=width_pt, height_pt=height_pt, right_side=right_side)
             print(f"已完成第{i+1}/{len(chunks)}张图表")
     
-    opju_path = os.path.join(folder, f"拉伸曲线_{fname}.opju")
     save_origin_project(opju_path)
     
     try:
         prs.SaveAs(os.path.abspath(ppt_path))
         prs.Close()
-    except: pass
+    except Exception: pass
     
     return f"成功！已创建 {len(chunks)} 张图表\nPPT: {ppt_path}\nOrigin项目: {opju_path}"
 
 
+def plot_tensile_to_ppt(file_path, template_path=None, lines_per_graph=12, swap_xy=True, append_to_ppt=None, width_cm=15.0, height_cm=12.0, copy_to_ppt=True):
+    """拉伸报告Origin绘图，可选是否导出到PPT
+    
+    参数:
+        copy_to_ppt: 是否复制图形到PPT，默认True。如果为False，只在Origin中绘图。
+    """
+    try:
+        if op.oext:
+            op.set_show(True)
+    except Exception: pass
+    
+    # 识别工作表、提取试样编号、读取曲线数据共用同一个ExcelFile
+    xls = _get_xls(file_path)
+    sample_ids = get_tensile_sample_ids(file_path, xls)
+    print(f"提取到试样编号: {sample_ids}")
+    
+    df = None
+    for sheet in xls.sheet_names:
+        if '曲线' in sheet:
+            df = _read_sheet(file_path, sheet)
+            break
+    if df is None:
+        df = _read_sheet(file_path)
+    
+    return _plot_xyxy(file_path, df, sample_ids, 'T', '拉伸曲线', template_path, lines_per_graph,
+                      width_cm, height_cm, copy_to_ppt, append_to_ppt=append_to_ppt, right_side=False)
+
+
 def plot_vda_to_ppt(file_path, template_path=None, lines_per_graph=12, swap_xy=True, width_cm=15.0, height_cm=12.0, copy_to_ppt=True):
     """VDA报告Origin绘图，可选是否导出到PPT
     
     参数:
         copy_to_ppt: 是否复制图形到PPT，默认True。如果为False，只在Origin中绘图。
     """
-    import win32com.client
-    import pythoncom
-    
     try:
         if op.oext:
             op.set_show(True)
-    except: pass
+    except Exception: pass
     
-    sample_ids = get_sample_ids_from_excel(file_path)
+    # 识别工作表、提取试样编号、读取曲线数据共用同一个ExcelFile
+    xls = _get_xls(file_path)
+    sample_ids = get_sample_ids_from_excel(file_path, xls=xls)
     print(f"VDA提取到试样编号: {sample_ids}")
     
-    xls = pd.ExcelFile(file_path)
     df = None
     for sheet in xls.sheet_names:
         if '原始数据' in sheet or 'VDA' in sheet:
-            df = pd.read_excel(xls, sheet_name=sheet)
-            if '力_1' in str(df.columns) or '力_' in ' '.join(str(c) for c in df.columns):
+            df = _read_sheet(file_path, sheet)
+            if df.columns.astype(str).str.contains('力_', regex=False).any():
                 break
     if df is None:
-        df = pd.read_excel(file_path)
-    
-    cols = list(df.columns)
-    new_cols, reordered_cols = [], []
-    sample_idx = 0
-    for i in range(0, len(cols) - 1, 2):
-        reordered_cols.extend([cols[i + 1], cols[i]])
-        new_cols.append(cols[i + 1])
-        new_cols.append(sample_ids[sample_idx] if sample_idx < len(sample_ids) else cols[i])
-        sample_idx += 1
-    if len(cols) % 2 == 1:
-        reordered_cols.append(cols[-1])
-        new_cols.append(cols[-1])
-    
-    df = df[reordered_cols]
-    df.columns = new_cols
+        df = _read_sheet(file_path)
     
-    wb = op.new_book()
-    wks = wb[0]
-    wks.from_df(df)
-    
-    num_cols = wks.cols
-    for col_idx in range(num_cols):
-        op.lt_exec(f'wks.col{col_idx + 1}.type = {4 if col_idx % 2 == 0 else 1};')
-    
-    y_cols = list(range(1, num_cols, 2))
-    chunks = [y_cols[i:i + lines_per_graph] for i in range(0, len(y_cols), lines_per_graph)]
-    
-    folder = os.path.dirname(file_path)
-    fname = os.path.splitext(os.path.basename(file_path))[0]
-    
-    # 如果不需要复制到PPT，只在Origin中绘图
-    if not copy_to_ppt:
-        created_graphs = []
-        for i, chunk in enumerate(chunks):
-            graph = op.new_graph(template=template_path) if template_path else op.new_graph()
-            layer = graph[0]
-            for y_idx in chunk:
-                layer.add_plot(wks, coly=y_idx, colx=y_idx - 1, type='line')
-            layer.rescale()
-            gname = f"{fname}_V{i+1}"
-            graph.name = gname
-            created_graphs.append(gname)
-            print(f"已完成第{i+1}/{len(chunks)}张图表")
-        
-        # 保存Origin项目
-        opju_path = os.path.join(folder, f"VDA曲线_{fname}.opju")
-        save_origin_project(opju_path)
-        
-        return f"成功！已在Origin中创建 {len(created_graphs)} 张图表\nOrigin项目: {opju_path}"
-    
-    # 以下是复制到PPT的逻辑
-    ppt_path = os.path.join(folder, f"VDA曲线_{fname}.pptx")
-    
-    # cm转pt (1cm ≈ 28.35pt)
-    width_pt = width_cm * 28.35
-    height_pt = height_cm * 28.35
-    
-    # 初始化PPT
-    pythoncom.CoInitialize()
-    op.lt_exec('doc -s;')
-    time.sleep(0.3)
-    
-    ppt_app = win32com.client.Dispatch("PowerPoint.Application")
-    ppt_app.Visible = True
-    prs = ppt_app.Presentations.Add()
-    
-    # 边绘图边导出OLE
-    for i, chunk in enumerate(chunks):
-        # 1. 绘图
-        graph = op.new_graph(template=template_path) if template_path else op.new_graph()
-        layer = graph[0]
-        for y_idx in chunk:
-            layer.add_plot(wks, coly=y_idx, colx=y_idx - 1, type='line')
-        layer.rescale()
-        gname = f"{fname}_V{i+1}"
-        graph.name = gname
-        
-        # 2. 新建PPT页面
-        prs.Slides.Add(prs.Slides.Count + 1, 12)
-        
-        # 3. 激活图形并Ctrl+J复制，粘贴到PPT
-        copy_graph_to_ppt_ole(gname, prs, prs.Slides.Count, width_pt=width_pt, height_pt=height_pt)
-        print(f"已完成第{i+1}/{len(chunks)}张图表")
-    
-    # 保存
-    opju_path = os.path.join(folder, f"VDA曲线_{fname}.opju")
-    save_origin_project(opju_path)
-    
-    try:
-        prs.SaveAs(os.path.abspath(ppt_path))
-        prs.Close()
-    except: pass
-    
-    return f"成功！已创建 {len(chunks)} 张图表\nPPT: {ppt_path}\nOrigin项目: {opju_path}"
+    return _plot_xyxy(file_path, df, sample_ids, 'V', 'VDA曲线', template_path, lines_per_graph,
+                      width_cm, height_cm, copy_to_ppt, right_side=True)
+
+
+# 相变点CSV可能的编码，按顺序尝试
+PHASE_CSV_ENCODINGS = ('utf-8', 'gbk')
+
+def _read_lines_detect_encoding(file_path, n=5):
+    """依次尝试候选编码读取前n行，返回(行列表, 编码)；都无法解码时按latin-1读取"""
+    for encoding in PHASE_CSV_ENCODINGS:
+        try:
+            with open(file_path, 'r', encoding=encoding) as f:
+                return list(islice(f, n)), encoding
+        except UnicodeDecodeError:
+            continue
+    with open(file_path, 'r', encoding='latin-1') as f:
+        return list(islice(f, n)), 'latin-1'
 
 
 def find_phase_columns_from_header(file_path):
     """从CSV文件第5行表头识别温度列和长度变化列
     
-    返回: (temp_col_idx, change_col_idx) 温度列索引和长度变化列索引
+    结果按(路径, 修改时间)缓存，重复提交同一批文件时不再重新读取表头。
+    返回: (temp_col_idx, change_col_idx, encoding) 温度列索引、长度变化列索引和文件编码
     """
+    return _phase_cols_cached(file_path, os.path.getmtime(file_path))
+
+
+@lru_cache(maxsize=256)
+def _phase_cols_cached(file_path, mtime):
+    """find_phase_columns_from_header 的缓存实现，mtime 仅用作缓存键"""
     temp_idx = None
     change_idx = None
+    encoding = PHASE_CSV_ENCODINGS[0]
     
-    # 读取第5行作为表头（索引为4）
+    # 只读取前5行，第5行作为表头（索引为4），同时确定文件编码
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-            if len(lines) >= 5:
-                header_line = lines[4]  # 第5行（索引4）
-                # 使用分号分隔
-                headers = header_line.strip().split(';')
-                print(f"读取到表头: {headers}")
+        lines, encoding = _read_lines_detect_encoding(file_path)
+        if len(lines) >= 5:
+            header_line = lines[4]  # 第5行（索引4）
+            # 使用分号分隔
+            headers = header_line.strip().split(';')
+            print(f"读取到表头: {headers}")
+            
+            for i, col in enumerate(headers):
+                col_str = str(col).lower().strip()
+                
+                # 识别温度列：包含 "temperature" 或 "temp" 或 "温度"
+                if temp_idx is None:
+                    if 'temperature' in col_str or 'temp' in col_str or '温度' in col_str:
+                        temp_idx = i
+                        print(f"识别到温度列: 第{i+1}列 '{col}'")
                 
-                for i, col in enumerate(headers):
-                    col_str = str(col).lower().strip()
-                    
-                    # 识别温度列：包含 "temperature" 或 "temp" 或 "温度"
-                    if temp_idx is None:
-                        if 'temperature' in col_str or 'temp' in col_str or '温度' in col_str:
-                            temp_idx = i
-                            print(f"识别到温度列: 第{i+1}列 '{col}'")
-                    
-                    # 识别长度变化列：包含 "change" 或 "length" 或 "长度" 或 "变化"
-                    if change_idx is None:
-                        if 'change' in col_str or 'length' in col_str or '长度' in col_str or '变化' in col_str:
-                            change_idx = i
-                            print(f"识别到长度变化列: 第{i+1}列 '{col}'")
+                # 识别长度变化列：包含 "change" 或 "length" 或 "长度" 或 "变化"
+                if change_idx is None:
+                    if 'change' in col_str or 'length' in col_str or '长度' in col_str or '变化' in col_str:
+                        change_idx = i
+                        print(f"识别到长度变化列: 第{i+1}列 '{col}'")
     except Exception as e:
         print(f"读取表头时出错: {e}")
     
@@ -794,7 +977,78 @@ def find_phase_columns_from_header(file_path):
         change_idx = 3  # 默认第4列
         print(f"未识别到长度变化列表头，使用默认: 第{change_idx+1}列")
     
-    return temp_idx, change_idx
+    return temp_idx, change_idx, encoding
+
+
+def _read_phase_csv_arrow(file_path, encoding, usecols=None):
+    """使用pyarrow多线程解析相变点CSV（分号分隔、逗号小数点），列名为列序号"""
+    # 自动生成的列名为 f0, f1, ...
+    include = [f'f{i}' for i in dict.fromkeys(usecols)] if usecols else []
+    table = pacsv.read_csv(
+        file_path,
+        read_options=pacsv.ReadOptions(skip_rows=6, autogenerate_column_names=True, encoding=encoding),
+        parse_options=pacsv.ParseOptions(delimiter=';'),
+        convert_options=pacsv.ConvertOptions(decimal_point=',', include_columns=include))
+    df = table.to_pandas()
+    df.columns = [int(name[1:]) for name in table.column_names]
+    return df
+
+
+def read_phase_csv(file_path, encoding='utf-8', usecols=None):
+    """读取相变点CSV的数据部分（分号分隔，跳过前6行：第5行表头+第6行单位）
+    
+    编码由 find_phase_columns_from_header 读取表头时确定，只解析一次。
+    usecols 指定只解析的列序号，其余列不做类型转换。
+    优先使用pyarrow解析；未安装pyarrow或文件行格式不规整时使用pandas。
+    返回: DataFrame，列名为原文件中的列序号
+    """
+    if pacsv is not None:
+        try:
+            return _read_phase_csv_arrow(file_path, encoding, usecols)
+        except Exception:
+            pass
+    
+    # 编码仅由前5行判定，数据区个别无法解码的字节替换处理，不中断读取
+    return pd.read_csv(file_path, sep=';', encoding=encoding, encoding_errors='replace', skiprows=6,
+                       header=None, decimal=',', usecols=usecols)
+
+
+def load_phase_data(file_path):
+    """读取单个相变点CSV并提取温度/长度变化两列
+    
+    返回: 列为 Temperature/Change 的DataFrame；数据列不足或没有有效数据行时返回None
+    """
+    # 先从第5行表头识别列
+    temp_idx, change_idx, encoding = find_phase_columns_from_header(file_path)
+    
+    # 只解析温度列和长度变化列；文件列数不足时跳过该文件
+    try:
+        df = read_phase_csv(file_path, encoding, usecols=[temp_idx, change_idx])
+    except ValueError as e:
+        print(f"读取数据列失败，跳过 {os.path.basename(file_path)}: {e}")
+        return None
+    
+    # 提取数据（欧洲格式的逗号小数点一般已由 decimal=',' 在解析时处理）
+    x = _phase_values(df[temp_idx])
+    y = _phase_values(df[change_idx])
+    
+    # 直接在两个数组上剔除无效行，最后再构建DataFrame
+    mask = np.isfinite(x) & np.isfinite(y)
+    if not mask.any():
+        print(f"未读取到有效数据，跳过 {os.path.basename(file_path)}")
+        return None
+    return pd.DataFrame({'Temperature': x[mask], 'Change': y[mask]})
+
+
+def _phase_values(col):
+    """将数据列转换为浮点数组
+    
+    列中含有非数字单元格（如"---"）时整列按字符串读取，decimal=','不生效，
+    此时先把逗号小数点替换为点号再转换，只有真正无效的单元格变为NaN
+    """
+    if not pd.api.types.is_numeric_dtype(col):
+        col = col.astype(str).str.replace(',', '.', regex=False)
+    return pd.to_numeric(col, errors='coerce').to_numpy(dtype=float)
 
 
 def plot_phase_change(file_paths, template_path=None, width_cm=11.0, height_cm=8.8, copy_to_ppt=True):
@@ -807,12 +1061,10 @@ def plot_phase_change(file_paths, template_path=None, width_cm=11.0, height_cm=8
         如果copy_to_ppt=True: (ppt_path, opju_path, count)
         如果copy_to_ppt=False: (opju_path, count)
     """
-    import win32com.client
-    import pythoncom
     try:
         if op.oext:
             op.set_show(True)
-    except: pass
+    except Exception: pass
     
     if isinstance(file_paths, str):
         file_paths = [file_paths]
@@ -821,30 +1073,16 @@ def plot_phase_change(file_paths, template_path=None, width_cm=11.0, height_cm=8
     count = 0
     created_graphs = []
     
+    # 先并行读取和清洗所有CSV（文件读取和解析不依赖Origin），Origin操作仍在主线程依次执行
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(file_paths)))) as executor:
+        plot_dfs = list(executor.map(load_phase_data, file_paths))
+    
     # 如果不需要复制到PPT，只在Origin中绘图
     if not copy_to_ppt:
-        for i, file_path in enumerate(file_paths):
-            # 先从第5行表头识别列
-            temp_idx, change_idx = find_phase_columns_from_header(file_path)
-            
-            # 读取CSV，分号分隔，跳过前5行（第6行开始是数据，第6行是单位行也跳过）
-            try:
-                df = pd.read_csv(file_path, sep=';', encoding='utf-8', skiprows=6, header=None)
-            except:
-                try:
-                    df = pd.read_csv(file_path, sep=';', encoding='gbk', skiprows=6, header=None)
-                except:
-                    df = pd.read_csv(file_path, skiprows=6, header=None)
-            
-            if df.shape[1] < 2:
+        for i, (file_path, plot_df) in enumerate(zip(file_paths, plot_dfs)):
+            if plot_df is None:
                 continue
             
-            # 提取数据（处理欧洲格式：逗号作为小数点）
-            x_data = pd.to_numeric(df.iloc[:, temp_idx].astype(str).str.replace(',', '.'), errors='coerce')
-            y_data = pd.to_numeric(df.iloc[:, change_idx].astype(str).str.replace(',', '.'), errors='coerce')
-            
-            plot_df = pd.DataFrame({'Temperature': x_data, 'Change': y_data}).dropna()
-            
             wb = op.new_book()
             wks = wb[0]
             wks.from_df(plot_df)
@@ -875,39 +1113,18 @@ def plot_phase_change(file_paths, template_path=None, width_cm=11.0, height_cm=8
     height_pt = height_cm * 28.35
     
     # 初始化PPT
-    pythoncom.CoInitialize()
     op.lt_exec('doc -s;')
-    time.sleep(0.3)
     
-    ppt_app = win32com.client.Dispatch("PowerPoint.Application")
-    ppt_app.Visible = True
+    ppt_app = get_ppt_app()
     prs = ppt_app.Presentations.Add()
     
     ppt_path = os.path.join(folder, f"相变点曲线.pptx")
     
     # 边绘图边导出OLE
-    for i, file_path in enumerate(file_paths):
-        # 先从第5行表头识别列
-        temp_idx, change_idx = find_phase_columns_from_header(file_path)
-        
-        # 读取CSV，分号分隔，跳过前6行（第5行表头+第6行单位）
-        try:
-            df = pd.read_csv(file_path, sep=';', encoding='utf-8', skiprows=6, header=None)
-        except:
-            try:
-                df = pd.read_csv(file_path, sep=';', encoding='gbk', skiprows=6, header=None)
-            except:
-                df = pd.read_csv(file_path, skiprows=6, header=None)
-        
-        if df.shape[1] < 2:
+    for i, (file_path, plot_df) in enumerate(zip(file_paths, plot_dfs)):
+        if plot_df is None:
             continue
         
-        # 提取数据（处理欧洲格式：逗号作为小数点）
-        x_data = pd.to_numeric(df.iloc[:, temp_idx].astype(str).str.replace(',', '.'), errors='coerce')
-        y_data = pd.to_numeric(df.iloc[:, change_idx].astype(str).str.replace(',', '.'), errors='coerce')
-        
-        plot_df = pd.DataFrame({'Temperature': x_data, 'Change': y_data}).dropna()
-        
         wb = op.new_book()
         wks = wb[0]
         wks.from_df(plot_df)
@@ -924,7 +1141,7 @@ def plot_phase_change(file_paths, template_path=None, width_cm=11.0, height_cm=8
         graph.name = gname
         
         # 新建PPT页面并复制OLE
-        prs.Slides.Add(prs.Slides.Count + 1, 12)
+        prs.Slides.Add(prs.Slides.Count + 1, PP_LAYOUT_BLANK)
         copy_graph_to_ppt_ole(gname, prs, prs.Slides.Count, width_pt=width_pt, height_pt=height_pt, right_side=False)
         count += 1
         print(f"已完成第{i+1}/{len(file_paths)}张图表: {fname} -> {gname}")
@@ -936,6 +1153,6 @@ def plot_phase_change(file_paths, template_path=None, width_cm=11.0, height_cm=8
     try:
         prs.SaveAs(os.path.abspath(ppt_path))
         prs.Close()
-    except: pass
+    except Exception: pass
     
     return ppt_path, opju_path, count
@@ -12,8 +12,8 @@
     提供PowerPoint文件操作的共享工具函数。
 
 主要功能：
-    - 表格行列的增删操作
-    - 幻灯片复制功能
+    - 表格行列的增删操作（支持一次增删多行）
+    - 幻灯片复制功能（支持一次复制多份）
     - 单元格格式化和文本替换
     - 单元格合并信息清理
 
@@ -21,6 +21,7 @@ Copyright (c) 2024 育材堂. All rights reserved.
 """
 
 import copy
+import functools
 from pptx.util import Pt
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
@@ -30,8 +31,9 @@ from pptx.oxml.ns import qn
 THEME_COLOR = RGBColor(25, 137, 141)
 RED_COLOR = RGBColor(255, 0, 0)
 
+@functools.lru_cache(maxsize=4096)
 def to_float(val):
-    """安全转换为浮点数"""
+    """安全转换为浮点数（报告数据中"0"、空串和相同测量值大量重复，结果按参数缓存）"""
     try:
         return float(val) if val is not None else 0.0
     except:
@@ -95,11 +97,29 @@ def delete_table_row(table, row_idx):
     tr = table.rows[row_idx]._tr
     tr.getparent().remove(tr)
 
+def delete_table_rows(table, row_idx, count):
+    """一次删除从row_idx开始的连续count行（超出表格末尾的部分忽略）"""
+    if row_idx < 0 or count <= 0:
+        return
+    trs = table._tbl.tr_lst[row_idx:row_idx + count]
+    if not trs:
+        return
+    tbl = trs[0].getparent()
+    start = tbl.index(trs[0])
+    del tbl[start:start + len(trs)]
+
 def insert_table_row(table, target_idx, source_idx):
     """
     在指定位置插入新行（修复版）
     修复：复制时仅清除垂直合并(vMerge)，必须保留水平合并(gridSpan)以维持表格结构完整性。
     """
+    insert_table_rows(table, target_idx, source_idx, 1)
+    return table.rows[target_idx]
+
+def insert_table_rows(table, target_idx, source_idx, count):
+    """在target_idx处一次插入count个source_idx行的副本，源行只复制和清理一次"""
+    if count <= 0:
+        return
     tbl = table._tbl
     source_tr = table.rows[source_idx]._tr
     new_tr = copy.deepcopy(source_tr)
@@ -122,37 +142,44 @@ def insert_table_row(table, target_idx, source_idx):
                         for r in p.r_lst:
                             p.remove(r)
     
-    if target_idx < len(table.rows):
-        table.rows[target_idx]._tr.addprevious(new_tr)
-    else:
-        tbl.append(new_tr)
+    new_trs = [new_tr] + [copy.deepcopy(new_tr) for _ in range(count - 1)]
     
-    return table.rows[target_idx]
+    # 一次切片插入，避免逐行插入时反复调整子节点
+    trs = tbl.tr_lst
+    pos = tbl.index(trs[target_idx]) if target_idx < len(trs) else len(tbl)
+    tbl[pos:pos] = new_trs
 
 def duplicate_slide(prs, index):
     """复制幻灯片 - 简化版本"""
+    return duplicate_slides(prs, index, 1)[0]
+
+def duplicate_slides(prs, index, count):
+    """将幻灯片复制count份追加到末尾，源页布局和形状只读取一次"""
     source_slide = prs.slides[index]
     
     # 获取源幻灯片的布局
     try:
         slide_layout = source_slide.slide_layout
-    except:
+    except Exception:
         slide_layout = prs.slide_layouts[0]
     
-    # 添加新幻灯片
-    new_slide = prs.slides.add_slide(slide_layout)
+    source_elements = [shape.element for shape in source_slide.shapes]
     
-    # 清除新幻灯片的默认占位符
-    spTree = new_slide.shapes._spTree
-    for sp in list(spTree)[2:]:
-        spTree.remove(sp)
-    
-    # 复制源幻灯片的形状
-    for shape in source_slide.shapes:
-        new_el = copy.deepcopy(shape.element)
-        spTree.append(new_el)
+    new_slides = []
+    for _ in range(count):
+        # 添加新幻灯片
+        new_slide = prs.slides.add_slide(slide_layout)
+        
+        # 清除新幻灯片的默认占位符
+        spTree = new_slide.shapes._spTree
+        for sp in list(spTree)[2:]:
+            spTree.remove(sp)
+        
+        # 复制源幻灯片的形状
+        spTree.extend(copy.deepcopy(el) for el in source_elements)
+        new_slides.append(new_slide)
     
-    return new_slide
+    return new_slides
 
 def format_cell(cell, text, font_size=14, is_bold=False, color_rgb=None):
     """格式化单元格"""
@@ -20,81 +20,168 @@
 Copyright (c) 2024 育材堂. All rights reserved.
 """
 
-import pdfplumber
+import os
+import re
+import json
+import hashlib
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import config_manager
 
-def parse_hardness_report(file_path):
-    extracted_data = []
-    print(f"--- 开始处理文件: {file_path} ---")
+# 提取结果缓存目录：按PDF内容哈希保存，同一文件再次提取时跳过pdfplumber解析
+CACHE_DIR = os.path.join(config_manager.CONFIG_DIR, "cache", "hardness")
+# 提取逻辑或结果结构变化时递增，使旧缓存失效
+CACHE_VERSION = 2
+
+# 页数达到该值时才使用进程池并行解析（子进程启动和导入pdfplumber有固定开销）
+PARALLEL_MIN_PAGES = 4
+
+# 统计表都有完整表格线，只按线条识别表格，不做文字聚类推断
+TABLE_SETTINGS = {
+    "vertical_strategy": "lines",
+    "horizontal_strategy": "lines",
+    "snap_tolerance": 3,
+}
+
+# 统计表表头关键字：标准差列和平均值列
+_SD_RE = re.compile(r'SD|Std')
+_MEAN_RE = re.compile(r'平均|Average|Mean')
+
+def _cache_file(file_path, pages=None):
+    """返回PDF对应的缓存文件路径（按缓存版本和文件内容SHA-256命名，指定页码时附加页码）"""
+    with open(file_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    if pages:
+        digest += "_p" + "-".join(map(str, pages))
+    return os.path.join(CACHE_DIR, f"v{CACHE_VERSION}_{digest}.json")
+
+def parse_hardness_report(file_path, pages=None, no_cache=False):
+    """提取PDF中的硬度统计数据，结果按文件内容缓存
     
-    # 1. 初始化自动计数器，从1开始
-    auto_id_counter = 1
+    pages: 只解析的页码列表（从1开始），默认解析全部页面
+    no_cache: 为True时忽略缓存，强制重新解析
+    """
+    cache_file = None
+    if not no_cache:
+        try:
+            cache_file = _cache_file(file_path, pages)
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                extracted_data = json.load(f)
+            print(f"--- 使用缓存结果: {file_path} ---")
+            return extracted_data
+        except (OSError, ValueError):
+            pass
     
-    try:
-        with pdfplumber.open(file_path) as pdf:
-            for i, page in enumerate(pdf.pages):
-                tables = page.extract_tables()
-                if not tables: continue
-                
-                for table in tables:
-                    # 数据清洗
-                    clean_table = [[str(cell).strip() if cell else "" for cell in row] for row in table]
-                    if len(clean_table) < 2: continue
+    extracted_data = _parse_pdf(file_path, pages)
+    
+    # 只缓存成功的提取结果
+    if cache_file and extracted_data and "error" not in extracted_data[0]:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(extracted_data, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"写入缓存失败: {e}")
+    return extracted_data
 
-                    # 识别表头
-                    header = clean_table[0]
-                    header_str = " ".join(header).replace("\n", "")
-                    
-                    # 检查是否是统计表 (必须包含 SD 和 平均值)
-                    # 这里的匹配逻辑还是必须的，为了防止读到非统计数据的表格
-                    if ("SD" in header_str or "Std" in header_str) and \
-                       ("平均" in header_str or "Average" in header_str or "Mean" in header_str):
-                        
-                        mean_idx = -1
-                        sd_idx = -1
-                        
-                        # 只需要找数据列，不再关心 ID 列在哪里
-                        for idx, col_name in enumerate(header):
-                            col = col_name.replace("\n", "").strip()
-                            if "平均" in col or "Average" in col or "Mean" in col:
-                                mean_idx = idx
-                            if "SD" in col or "Std" in col:
-                                sd_idx = idx
-                        
-                        # 如果找到了关键的数据列
-                        if mean_idx != -1 and sd_idx != -1:
-                            # 跳过表头，读取数据行
-                            for row in clean_table[1:]:
-                                # 确保行长度足够
-                                if len(row) <= max(mean_idx, sd_idx):
-                                    continue
-                                
-                                raw_mean = row[mean_idx]
-                                raw_sd = row[sd_idx]
-                                
-                                # 只有当均值和SD都有数据时才处理
-                                if raw_mean and raw_sd:
-                                    # 尝试转数字
-                                    try:
-                                        num_mean = float(raw_mean)
-                                        num_sd = float(raw_sd)
-                                    except:
-                                        num_mean = raw_mean
-                                        num_sd = raw_sd
+def _page_values(page):
+    """识别单页中的统计表，返回该页所有 (均值, SD) 数据"""
+    values = []
+    tables = page.extract_tables(table_settings=TABLE_SETTINGS)
+    # 释放该页已解析的对象，多页报告内存不随页数累积
+    page.flush_cache()
+    
+    for table in tables:
+        # 数据清洗
+        clean_table = [[str(cell).strip() if cell else "" for cell in row] for row in table]
+        if len(clean_table) < 2: continue
 
-                                    # --- 核心修改：直接使用计数器作为 ID ---
-                                    current_id = str(auto_id_counter)
-                                    auto_id_counter += 1 
-                                    # ------------------------------------
+        # 识别表头
+        header = clean_table[0]
+        header_str = " ".join(header).replace("\n", "")
+        
+        # 检查是否是统计表 (必须包含 SD 和 平均值)
+        # 这里的匹配逻辑还是必须的，为了防止读到非统计数据的表格
+        if _SD_RE.search(header_str) and _MEAN_RE.search(header_str):
+            
+            mean_idx = -1
+            sd_idx = -1
+            
+            # 只需要找数据列，不再关心 ID 列在哪里
+            # 有多个匹配列时取最后一列：从后往前找，两列都找到即停止
+            for idx in range(len(header) - 1, -1, -1):
+                col = header[idx].replace("\n", "")
+                if mean_idx == -1 and _MEAN_RE.search(col):
+                    mean_idx = idx
+                if sd_idx == -1 and _SD_RE.search(col):
+                    sd_idx = idx
+                if mean_idx != -1 and sd_idx != -1:
+                    break
+            
+            # 如果找到了关键的数据列
+            if mean_idx != -1 and sd_idx != -1:
+                # 跳过表头，读取数据行
+                for row in clean_table[1:]:
+                    # 确保行长度足够
+                    if len(row) <= max(mean_idx, sd_idx):
+                        continue
+                    
+                    raw_mean = row[mean_idx]
+                    raw_sd = row[sd_idx]
+                    
+                    # 只有当均值和SD都有数据时才处理
+                    if raw_mean and raw_sd:
+                        # 尝试转数字
+                        try:
+                            num_mean = float(raw_mean)
+                            num_sd = float(raw_sd)
+                        except ValueError:
+                            num_mean = raw_mean
+                            num_sd = raw_sd
+                        values.append((num_mean, num_sd))
+    return values
 
-                                    extracted_data.append({
-                                        "id": current_id,
-                                        "mean": num_mean,
-                                        "sd": num_sd
-                                    })
-                                    print(f"提取第 {current_id} 组: {num_mean} ± {num_sd}")
+def _parse_page(file_path, page_number):
+    """在子进程中单独打开PDF并解析第page_number页（从1开始）"""
+    import pdfplumber
+    with pdfplumber.open(file_path, pages=[page_number]) as pdf:
+        return _page_values(pdf.pages[0])
 
+def _parse_pdf(file_path, pages=None):
+    """使用pdfplumber解析PDF中的统计表
+    
+    页数较多时各页在进程池中并行解析（pdfminer解析为纯Python计算，线程无法并行），
+    全部完成后再按页码顺序编号
+    """
+    # pdfplumber(pdfminer)导入较慢，只在缓存未命中、确实需要解析时导入
+    import pdfplumber
+    
+    extracted_data = []
+    print(f"--- 开始处理文件: {file_path} ---")
+    
+    try:
+        with pdfplumber.open(file_path, pages=pages) as pdf:
+            page_numbers = [page.page_number for page in pdf.pages]
+            if len(page_numbers) < PARALLEL_MIN_PAGES:
+                page_values = [_page_values(page) for page in pdf.pages]
+        
+        if len(page_numbers) >= PARALLEL_MIN_PAGES:
+            workers = min(len(page_numbers), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                page_values = list(executor.map(partial(_parse_page, file_path), page_numbers))
     except Exception as e:
         print(f"Error: {e}")
         return [{"error": str(e)}]
+    
+    # 按页码顺序直接使用计数器作为 ID，从1开始
+    for values in page_values:
+        for num_mean, num_sd in values:
+            current_id = str(len(extracted_data) + 1)
+            extracted_data.append({
+                "id": current_id,
+                "mean": num_mean,
+                "sd": num_sd
+            })
+            print(f"提取第 {current_id} 组: {num_mean} ± {num_sd}")
         
     return extracted_data
@@ -26,21 +26,148 @@
 Copyright (c) 2024 育材堂. All rights reserved.
 """
 
-import docx
-import openpyxl 
-import statistics
+import numpy as np
 import os
 import re
+import pickle
+import hashlib
+import functools
 import traceback 
+from lxml import etree
 from pptx import Presentation
+import config_manager
+
+# python-calamine（Rust实现）读取Excel比openpyxl快得多，未安装时回退到openpyxl
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
 from ppt_utils import (
-    to_float, delete_table_column, delete_table_row, insert_table_row as insert_row,
-    duplicate_slide, format_cell, clean_cell_merge_info, THEME_COLOR, RED_COLOR
+    to_float, delete_table_column, delete_table_rows, insert_table_rows,
+    duplicate_slides, format_cell, clean_cell_merge_info, THEME_COLOR, RED_COLOR
 )
 
 # ================= 1. 数据提取模块 =================
 
+# 试样编号中的括号备注，以及编号末尾的数字
+_PAREN_RE = re.compile(r'[\(（].*?[\)）]')
+_ENDS_DIGIT_RE = re.compile(r'\d$')
+
+def strip_note(raw_id):
+    """去掉试样编号中的括号备注；不含括号时（大多数情况）不经过正则"""
+    if '(' in raw_id or '（' in raw_id:
+        return _PAREN_RE.sub('', raw_id).strip()
+    return raw_id.strip()
+
+# 提取结果缓存目录：同一数据文件再次生成报告（如只切换Ag选项）时跳过解析
+CACHE_DIR = os.path.join(config_manager.CONFIG_DIR, "cache", "tensile")
+# 提取结果的数据结构变化时递增，使旧缓存失效
+CACHE_VERSION = 2
+
+def file_hash_cache(func):
+    """按文件内容和文件名哈希把提取结果 (project_id, groups) 缓存到磁盘"""
+    @functools.wraps(func)
+    def wrapper(path):
+        try:
+            with open(path, 'rb') as f:
+                h = hashlib.blake2b(f.read(), digest_size=16)
+        except OSError:
+            return func(path)
+        # 项目号可能取自文件名，文件名也计入缓存键
+        h.update(os.path.basename(path).encode('utf-8'))
+        cache_file = os.path.join(CACHE_DIR, f"{func.__name__}_v{CACHE_VERSION}_{h.hexdigest()}.pkl")
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+        
+        result = func(path)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_file, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"写入缓存失败: {e}")
+        return result
+    return wrapper
+
+def make_item(sample_num, thick, rp_val, rm_val, ag_val, a_val, has_note):
+    """生成单个试样的数据：屈服强度和抗拉强度四舍五入取整，A和Ag保留1位小数；
+    同时预先生成填表用的显示字符串（*_s），生成报告时直接使用"""
+    rp = round(rp_val) if rp_val else 0
+    rm = round(rm_val) if rm_val else 0
+    ag = round(ag_val, 1) if ag_val else 0.0
+    a = round(a_val, 1) if a_val else 0.0
+    return {
+        "id_num": sample_num,
+        "thick": thick,
+        "Rp": rp, "Rm": rm, "Ag": ag, "A": a,
+        "Rp_s": str(rp), "Rm_s": str(rm), "Ag_s": str(ag), "A_s": str(a),
+        "has_note": has_note
+    }
+
+# Word表格中需要读取的列：编号、厚度、Rp、Rm、Ag、A
+DOCX_COLUMNS = (1, 3, 8, 9, 10, 12)
+_W_NS = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+_W = '{%s}' % _W_NS['w']
+_P_XPATH = etree.XPath('./w:p', namespaces=_W_NS)
+# 段落中运行(run)内的文本、制表符和换行元素，按文档顺序
+_RUN_CONTENT_XPATH = etree.XPath(
+    './/w:r/*[self::w:t or self::w:tab or self::w:br or self::w:cr]', namespaces=_W_NS)
+
+def _paragraph_text(p):
+    """段落文本：w:tab为制表符，w:br/w:cr为换行（分页、分栏符不计），与python-docx的paragraph.text一致"""
+    parts = []
+    for el in _RUN_CONTENT_XPATH(p):
+        tag = el.tag
+        if tag == _W + 't':
+            parts.append(el.text or "")
+        elif tag == _W + 'tab':
+            parts.append("\t")
+        elif tag == _W + 'cr' or el.get(_W + 'type', 'textWrapping') == 'textWrapping':
+            parts.append("\n")
+    return "".join(parts)
+
+def _tc_text(tc):
+    """单元格文本（段落之间以换行连接，与python-docx的cell.text一致）"""
+    return "\n".join(_paragraph_text(p) for p in _P_XPATH(tc))
+
+def docx_table_rows(tbl, columns, start=0):
+    """直接遍历<w:tbl>的XML，按网格列号返回每行指定列的文本 (列数, {列号: 文本})
+    
+    横向合并(gridSpan)按跨越的列数展开，纵向合并(vMerge)的续行取上方单元格的文本，
+    与python-docx的row.cells取值一致；同时返回该行的网格列数
+    """
+    above = {}
+    for tr_idx, tr in enumerate(tbl.iterchildren(_W + 'tr')):
+        row = {}
+        grid_col = 0
+        for tc in tr.iterchildren(_W + 'tc'):
+            span, continued = 1, False
+            tcPr = tc.find(_W + 'tcPr')
+            if tcPr is not None:
+                gs = tcPr.find(_W + 'gridSpan')
+                if gs is not None:
+                    span = int(gs.get(_W + 'val'))
+                vm = tcPr.find(_W + 'vMerge')
+                continued = vm is not None and vm.get(_W + 'val') != 'restart'
+            for col in range(grid_col, grid_col + span):
+                if col in columns:
+                    if continued and col in above:
+                        row[col] = above[col]
+                    else:
+                        row[col] = _tc_text(tc)
+            grid_col += span
+        above = row
+        if tr_idx < start: continue
+        yield grid_col, row
+
+@file_hash_cache
 def extract_from_docx(docx_path):
+    import docx  # 只在实际解析Word时导入（缓存命中或处理Excel时不需要）
     doc = docx.Document(docx_path)
     project_id = "未知项目"
     try:
@@ -55,15 +182,13 @@ def extract_from_docx(docx_path):
 
     extracted_groups = {} 
     if not doc.tables: return project_id, {}
-    table = doc.tables[0]
     
-    for row in table.rows[2:]:
-        cells = row.cells
-        if len(cells) < 13: continue 
-        full_id = cells[1].text.strip()
+    for n_cols, cells in docx_table_rows(doc.tables[0]._tbl, DOCX_COLUMNS, start=2):
+        if n_cols < 13: continue 
+        full_id = cells[1].strip()
         if not full_id: continue
 
-        clean_id = re.sub(r'[\(（].*?[\)）]', '', full_id).strip()
+        clean_id = strip_note(full_id)
         has_note = (clean_id != full_id)
 
         if "-" in clean_id:
@@ -74,21 +199,12 @@ def extract_from_docx(docx_path):
             group_name = clean_id
             sample_num = "1"
 
-        # 屈服强度和抗拉强度四舍五入取整，A和Ag保留1位小数
-        rp_val = to_float(cells[8].text)
-        rm_val = to_float(cells[9].text)
-        ag_val = to_float(cells[10].text)
-        a_val = to_float(cells[12].text)
-        
-        item = {
-            "id_num": sample_num,
-            "thick": cells[3].text.strip(), # Word保持不变，如果Word也要改B列需确认位置
-            "Rp": round(rp_val) if rp_val else 0,
-            "Rm": round(rm_val) if rm_val else 0,
-            "Ag": round(ag_val, 1) if ag_val else 0.0,
-            "A":  round(a_val, 1) if a_val else 0.0,
-            "has_note": has_note
-        }
+        item = make_item(
+            sample_num,
+            cells[3].strip(), # Word保持不变，如果Word也要改B列需确认位置
+            to_float(cells[8]), to_float(cells[9]), to_float(cells[10]), to_float(cells[12]),
+            has_note
+        )
 
         if group_name not in extracted_groups:
             extracted_groups[group_name] = []
@@ -96,25 +212,36 @@ def extract_from_docx(docx_path):
 
     return project_id, extracted_groups
 
+def read_excel_rows(xlsx_path):
+    """读取Sheet1（不存在时为第一个工作表）的全部行，返回各行单元格值列表"""
+    if CalamineWorkbook is not None:
+        wb = CalamineWorkbook.from_path(xlsx_path)
+        name = "Sheet1" if "Sheet1" in wb.sheet_names else wb.sheet_names[0]
+        # 不跳过空白区域，保持列序号与表格一致
+        return wb.get_sheet_by_name(name).to_python(skip_empty_area=False)
+    
+    import openpyxl
+    wb = openpyxl.load_workbook(xlsx_path, data_only=True, read_only=True)
+    try:
+        sheet = wb["Sheet1"] if "Sheet1" in wb.sheetnames else wb.worksheets[0]
+        return list(sheet.iter_rows(min_row=1, values_only=True))
+    finally:
+        wb.close()
+
+@file_hash_cache
 def extract_from_excel(xlsx_path):
     project_id = os.path.splitext(os.path.basename(xlsx_path))[0]
-    wb = openpyxl.load_workbook(xlsx_path, data_only=True)
-    
-    if "Sheet1" in wb.sheetnames:
-        sheet = wb["Sheet1"]
-    else:
-        sheet = wb.worksheets[0]
-    
     extracted_groups = {}
     
-    for row in sheet.iter_rows(min_row=1, values_only=True):
-        if not row or row[0] is None: continue
+    for row in read_excel_rows(xlsx_path):
+        # calamine 空单元格为空字符串，openpyxl 为 None
+        if not row or row[0] is None or row[0] == "": continue
         
         raw_id = str(row[0]).strip()
-        clean_id = re.sub(r'[\(（].*?[\)）]', '', raw_id).strip()
+        clean_id = strip_note(raw_id)
         has_note = (clean_id != raw_id)
 
-        if "-" not in clean_id or not re.search(r'\d$', clean_id):
+        if "-" not in clean_id or not _ENDS_DIGIT_RE.search(clean_id):
             continue
 
         parts = clean_id.rsplit("-", 1)
@@ -124,6 +251,9 @@ def extract_from_excel(xlsx_path):
         try:
             # --- 修改点 1: 抓取 B 列 (Index 1) 作为宽度/厚度 ---
             thick_val = row[1] if len(row) > 1 else "" 
+            # calamine 将整数读为浮点数，与openpyxl保持一致显示为整数
+            if isinstance(thick_val, float) and thick_val.is_integer():
+                thick_val = int(thick_val)
             # -----------------------------------------------
             
             rp_val = row[6] if len(row) > 6 else 0
@@ -131,21 +261,12 @@ def extract_from_excel(xlsx_path):
             ag_val = row[8] if len(row) > 8 else 0
             a_val  = row[10] if len(row) > 10 else 0
             
-            # 屈服强度和抗拉强度四舍五入取整，A和Ag保留1位小数
-            rp_float = to_float(rp_val)
-            rm_float = to_float(rm_val)
-            ag_float = to_float(ag_val)
-            a_float = to_float(a_val)
-            
-            item = {
-                "id_num": sample_num,
-                "thick": str(thick_val) if thick_val is not None else "",
-                "Rp": round(rp_float) if rp_float else 0,
-                "Rm": round(rm_float) if rm_float else 0,
-                "Ag": round(ag_float, 1) if ag_float else 0.0,
-                "A":  round(a_float, 1) if a_float else 0.0,
-                "has_note": has_note
-            }
+            item = make_item(
+                sample_num,
+                str(thick_val) if thick_val is not None else "",
+                to_float(rp_val), to_float(rm_val), to_float(ag_val), to_float(a_val),
+                has_note
+            )
             
             if group_name not in extracted_groups:
                 extracted_groups[group_name] = []
@@ -155,29 +276,18 @@ def extract_from_excel(xlsx_path):
             print(f"Skipping row {raw_id}: {e}")
             continue
 
-    wb.close()
     return project_id, extracted_groups
 
+# 统计字段及显示的小数位数：强度取整，延伸率保留1位小数
+STAT_DECIMALS = {'Rp': 0, 'Rm': 0, 'Ag': 1, 'A': 1}
+
 def calculate_stats(group_data):
     if not group_data: return {}
-    stats = {}
-    for key in ['Rp', 'Rm']:
-        vals = [d[key] for d in group_data]
-        if len(vals) == 0:
-             stats[key] = "/"
-             continue
-        m = statistics.mean(vals)
-        s = statistics.stdev(vals) if len(vals) > 1 else 0.0
-        stats[key] = f"{m:.0f}±{s:.0f}"
-    for key in ['Ag', 'A']:
-        vals = [d[key] for d in group_data]
-        if len(vals) == 0:
-             stats[key] = "/"
-             continue
-        m = statistics.mean(vals)
-        s = statistics.stdev(vals) if len(vals) > 1 else 0.0
-        stats[key] = f"{m:.1f}±{s:.1f}"
-    return stats
+    # 一组数据构成 (n, 4) 数组，一次计算全部字段的均值和标准差
+    arr = np.array([[d[key] for key in STAT_DECIMALS] for d in group_data], dtype=np.float64)
+    means = arr.mean(axis=0)
+    stds = arr.std(axis=0, ddof=1) if len(arr) > 1 else np.zeros(len(STAT_DECIMALS))
+    return {key: f"{m:.{p}f}±{s:.{p}f}" for (key, p), m, s in zip(STAT_DECIMALS.items(), means, stds)}
 
 # ================= 2. 主流程控制器 =================
 
@@ -202,20 +312,19 @@ def generate_report(data_path, pptx_template_path, output_path, include_ag=True)
         if not tables: return "错误：PPT第1页未找到表格"
         template_table = tables[0]
         
-        # 计算每页容量
-        template_capacity = 0
-        for row in template_table.rows:
+        # 查找统计行位置并计算每页容量（各页都由第1页复制，统计行位置相同，只需查找一次）
+        avg_row_indices = []
+        for r, row in enumerate(template_table.rows):
             txt = "".join([c.text_frame.text for c in row.cells]).lower()
             if "平均" in txt or "average" in txt:
-                template_capacity += 1
-        if template_capacity == 0: template_capacity = 1
+                avg_row_indices.append(r)
+        template_capacity = len(avg_row_indices) or 1
         
         GROUPS_PER_SLIDE = template_capacity
         total_slides = (len(group_names) + GROUPS_PER_SLIDE - 1) // GROUPS_PER_SLIDE
         
         # 复制页面
-        for i in range(total_slides - 1):
-            duplicate_slide(prs, 0)
+        duplicate_slides(prs, 0, total_slides - 1)
             
         # 填充
         for slide_idx in range(total_slides):
@@ -240,29 +349,15 @@ def generate_report(data_path, pptx_template_path, output_path, include_ag=True)
 
             batch_groups = group_names[slide_idx*GROUPS_PER_SLIDE : (slide_idx+1)*GROUPS_PER_SLIDE]
             
-            # 查找统计行位置 (需要重新查找，因为行数是动态的)
-            avg_row_indices = []
-            for r, row in enumerate(main_table.rows):
-                txt = "".join([c.text_frame.text for c in row.cells]).lower()
-                if "平均" in txt or "average" in txt:
-                    avg_row_indices.append(r)
-            
-            # 倒序处理每一块
+            # 倒序处理每一块：插入/删除行只影响当前块及其后的行，
+            # 前面各块的统计行位置不变，无需每次重新查找
             for i in range(len(avg_row_indices) - 1, -1, -1):
                 if i >= GROUPS_PER_SLIDE: continue
                 
-                # 重新定位统计行 (因为上面插入/删除行会导致索引变化)
-                current_avg_rows = []
-                for r, row in enumerate(main_table.rows):
-                    txt = "".join([c.text_frame.text for c in row.cells]).lower()
-                    if "平均" in txt or "average" in txt:
-                        current_avg_rows.append(r)
-                
-                if i >= len(current_avg_rows): break
-                stat_row_idx = current_avg_rows[i]
+                stat_row_idx = avg_row_indices[i]
                 
                 if i == 0: start_row_idx = 1
-                else: start_row_idx = current_avg_rows[i-1] + 1
+                else: start_row_idx = avg_row_indices[i-1] + 1
                 
                 current_slots = stat_row_idx - start_row_idx
                 
@@ -274,13 +369,11 @@ def generate_report(data_path, pptx_template_path, output_path, include_ag=True)
                     
                     # 动态增减行
                     if n_samples > current_slots:
-                        for _ in range(n_samples - current_slots):
-                            insert_row(main_table, stat_row_idx, start_row_idx)
-                            stat_row_idx += 1 
+                        insert_table_rows(main_table, stat_row_idx, start_row_idx, n_samples - current_slots)
+                        stat_row_idx = start_row_idx + n_samples
                     elif n_samples < current_slots:
-                        for _ in range(current_slots - n_samples):
-                            delete_table_row(main_table, stat_row_idx - 1)
-                            stat_row_idx -= 1
+                        delete_table_rows(main_table, start_row_idx + n_samples, current_slots - n_samples)
+                        stat_row_idx = start_row_idx + n_samples
                     
                     # 清理合并
                     for k in range(n_samples):
@@ -294,22 +387,22 @@ def generate_report(data_path, pptx_template_path, output_path, include_ag=True)
                         font_color = RED_COLOR if item.get('has_note') else None
                         
                         format_cell(row.cells[0], g_name if k==0 else "")
-                        format_cell(row.cells[1], str(item['id_num']), color_rgb=font_color)
-                        format_cell(row.cells[2], str(item['thick']))
+                        format_cell(row.cells[1], item['id_num'], color_rgb=font_color)
+                        format_cell(row.cells[2], item['thick'])
                         
                         # --- 修改点 3: 动态填充 ---
                         # 确保单元格索引不越界
                         c_idx = 3
-                        if c_idx < len(row.cells): format_cell(row.cells[c_idx], str(item['Rp']))
+                        if c_idx < len(row.cells): format_cell(row.cells[c_idx], item['Rp_s'])
                         c_idx += 1
-                        if c_idx < len(row.cells): format_cell(row.cells[c_idx], str(item['Rm']))
+                        if c_idx < len(row.cells): format_cell(row.cells[c_idx], item['Rm_s'])
                         c_idx += 1
                         
                         if include_ag:
-                            if c_idx < len(row.cells): format_cell(row.cells[c_idx], str(item['Ag']))
+                            if c_idx < len(row.cells): format_cell(row.cells[c_idx], item['Ag_s'])
                             c_idx += 1
                         
-                        if c_idx < len(row.cells): format_cell(row.cells[c_idx], str(item['A']))
+                        if c_idx < len(row.cells): format_cell(row.cells[c_idx], item['A_s'])
                         # -------------------------
                     
                     # 合并组名
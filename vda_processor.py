@@ -25,16 +25,54 @@
 Copyright (c) 2024 育材堂. All rights reserved.
 """
 
+import numpy as np
 import pandas as pd
 import os
+import io
+import importlib.util
+from lxml import etree
 from pptx import Presentation
-from pptx.util import Pt
-from pptx.dml.color import RGBColor
+from pptx.oxml.ns import qn
 from ppt_utils import (
-    to_float, delete_table_column, delete_table_row, 
-    duplicate_slide, THEME_COLOR
+    delete_table_column, delete_table_rows, 
+    duplicate_slides, THEME_COLOR
 )
 
+# pyarrow（多线程C++解析CSV）和python-calamine（Rust读取Excel）均为可选依赖，未安装时使用pandas默认引擎
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else None
+EXCEL_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else None
+
+# CSV候选编码（按顺序尝试解码），以及xlsx(zip)/xls(OLE)文件头
+CSV_ENCODINGS = ('utf-8-sig', 'gbk', 'gb18030')
+EXCEL_MAGIC = (b'PK\x03\x04', b'\xd0\xcf\x11\xe0')
+
+def read_csv_bytes(raw):
+    """先确定编码只解码一次，再解析CSV；所有候选编码都无法解码时返回None"""
+    for encoding in CSV_ENCODINGS:
+        try:
+            text = raw.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        return None
+    
+    if CSV_ENGINE:
+        try:
+            return pd.read_csv(io.BytesIO(text.encode('utf-8')), engine=CSV_ENGINE)
+        except ValueError:
+            pass
+    return pd.read_csv(io.StringIO(text))
+
+def open_excel(raw):
+    """打开Excel数据；pandas版本不支持calamine引擎（<2.2）时回退到默认引擎"""
+    try:
+        return pd.ExcelFile(io.BytesIO(raw), engine=EXCEL_ENGINE)
+    except (ImportError, ValueError):
+        if EXCEL_ENGINE is None:
+            raise
+        return pd.ExcelFile(io.BytesIO(raw))
+
 def process_vda_report(excel_path, ppt_template, output_path, force_unit='kN', include_disp=True):
     """
     处理VDA弯曲数据并生成PPT报告
@@ -42,23 +80,28 @@ def process_vda_report(excel_path, ppt_template, output_path, force_unit='kN', i
     """
     print(f"--- 开始处理 VDA 弯曲报告: {excel_path} (单位: {force_unit}) ---")
     
-    # 1. 读取数据
+    # 1. 读取数据：文件只读一次，非Excel文件头时先按CSV解析
     try:
+        with open(excel_path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        return f"读取Excel/CSV失败: {str(e)}"
+    
+    df = None
+    if not raw.startswith(EXCEL_MAGIC):
         try:
-            df = pd.read_csv(excel_path, encoding='utf-8')
-        except:
-            try:
-                df = pd.read_csv(excel_path, encoding='gbk')
-            except:
-                df = pd.read_csv(excel_path, encoding='gb18030')
-    except:
+            df = read_csv_bytes(raw)
+        except ValueError:
+            df = None
+    
+    if df is None:
         try:
-            df = pd.read_excel(excel_path, sheet_name="2. VDA弯曲")
-        except:
-            try:
-                df = pd.read_excel(excel_path)
-            except Exception as e:
-                return f"读取Excel/CSV失败: {str(e)}"
+            xls = open_excel(raw)
+            # 优先读取"2. VDA弯曲"工作表，不存在时读取第一个工作表
+            sheet = "2. VDA弯曲" if "2. VDA弯曲" in xls.sheet_names else 0
+            df = xls.parse(sheet)
+        except Exception as e:
+            return f"读取Excel/CSV失败: {str(e)}"
 
     # 2. 列名映射
     col_map = {
@@ -86,24 +129,25 @@ def process_vda_report(excel_path, ppt_template, output_path, force_unit='kN', i
     missing = [c for c in required if c not in df.columns]
     if missing:
         return f"错误: Excel中找不到这些列: {missing}，请检查表头。"
+    
+    # 数值列一次转换为float64，填表和统计时直接使用
+    for col in required[1:]:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float64)
 
     # 3. 分组逻辑
     project_id = os.path.splitext(os.path.basename(excel_path))[0]
     
-    def parse_group(sid):
-        sid = str(sid).strip()
-        if '-' in sid:
-            parts = sid.rsplit('-', 1)
-            return parts[0], parts[1]
-        else:
-            return sid, "1"
-
-    df['GroupName'] = df['SampleID'].apply(lambda x: parse_group(x)[0])
-    df['Number'] = df['SampleID'].apply(lambda x: parse_group(x)[1])
+    # 按最后一个"-"拆分为组名和序号，不含"-"时整体为组名、序号为1
+    sid = df['SampleID'].astype(str).str.strip()
+    split = sid.str.rsplit('-', n=1, expand=True).reindex(columns=[0, 1])
+    df['GroupName'] = split[0]
+    df['Number'] = split[1].fillna("1")
 
     # 4. 准备PPT页面
     prs = Presentation(ppt_template)
-    unique_groups = df['GroupName'].unique()
+    # 一次分组并排序，填表时按组名直接取用（按首次出现的顺序）
+    group_frames = {name: sort_group(sub) for name, sub in df.groupby('GroupName', sort=False)}
+    unique_groups = list(group_frames)
     total_groups = len(unique_groups)
     
     if total_groups == 0:
@@ -112,9 +156,7 @@ def process_vda_report(excel_path, ppt_template, output_path, force_unit='kN', i
     groups_per_slide = 4
     num_slides_needed = (total_groups + groups_per_slide - 1) // groups_per_slide
     
-    if num_slides_needed > 1:
-        for _ in range(num_slides_needed - 1):
-            duplicate_slide(prs, 0)
+    duplicate_slides(prs, 0, num_slides_needed - 1)
     
     group_chunks = [unique_groups[i:i + groups_per_slide] for i in range(0, total_groups, groups_per_slide)]
 
@@ -135,7 +177,7 @@ def process_vda_report(excel_path, ppt_template, output_path, force_unit='kN', i
                 delete_table_column(main_table, 4)
         
         # 填充数据
-        process_table_chunk(main_table, chunk_groups, df, force_unit, include_disp)
+        process_table_chunk(main_table, chunk_groups, group_frames, force_unit, include_disp)
 
     # 6. 保存
     try:
@@ -146,7 +188,14 @@ def process_vda_report(excel_path, ppt_template, output_path, force_unit='kN', i
 
 # ================= 辅助函数 =================
 
-def process_table_chunk(table, groups, full_df, unit, include_disp):
+def sort_group(group_data):
+    """按序号排序一组数据；序号不全是整数时保持原顺序"""
+    try:
+        return group_data.assign(Number=group_data['Number'].astype(int)).sort_values('Number')
+    except (ValueError, TypeError):
+        return group_data
+
+def process_table_chunk(table, groups, group_frames, unit, include_disp):
     HEADER_ROWS = 1
     DEFAULT_DATA_ROWS = 3
     BLOCK_SIZE = DEFAULT_DATA_ROWS + 1 
@@ -158,28 +207,16 @@ def process_table_chunk(table, groups, full_df, unit, include_disp):
         
         if i < len(groups):
             group_name = groups[i]
-            group_data = full_df[full_df['GroupName'] == group_name].copy()
-            
-            try:
-                group_data['Number'] = group_data['Number'].astype(int)
-                group_data.sort_values('Number', inplace=True)
-            except: pass
-            
+            group_data = group_frames[group_name]
             n_data = len(group_data)
             diff = n_data - DEFAULT_DATA_ROWS
             current_stats_row_idx = current_start_row + DEFAULT_DATA_ROWS
             
             if diff > 0:
-                for _ in range(diff):
-                    add_table_row(table, current_stats_row_idx - 1)
-                    row_offset += 1
-                    current_stats_row_idx += 1
+                add_table_rows(table, current_stats_row_idx - 1, diff)
             elif diff < 0:
-                rows_to_del = abs(diff)
-                for _ in range(rows_to_del):
-                    delete_table_row(table, current_stats_row_idx - 1)
-                    current_stats_row_idx -= 1
-                    row_offset -= 1
+                delete_table_rows(table, current_stats_row_idx + diff, -diff)
+            row_offset += diff
             
             fill_group_data(table, group_data, group_name, current_start_row, n_data, unit, include_disp)
             stats_idx = current_start_row + n_data
@@ -187,12 +224,9 @@ def process_table_chunk(table, groups, full_df, unit, include_disp):
             
         else:
             if current_start_row >= len(table.rows): continue
-            try:
-                for _ in range(BLOCK_SIZE):
-                    if current_start_row < len(table.rows):
-                        delete_table_row(table, current_start_row)
-                        row_offset -= 1
-            except: pass
+            n_del = min(BLOCK_SIZE, len(table.rows) - current_start_row)
+            delete_table_rows(table, current_start_row, n_del)
+            row_offset -= n_del
 
 def fill_group_data(table, data, group_name, start_row, n_rows, unit, include_disp):
     if n_rows > 1:
@@ -202,40 +236,38 @@ def fill_group_data(table, data, group_name, start_row, n_rows, unit, include_di
             cell_top.merge(cell_bottom)
         except: pass
     
-    cell_name = table.cell(start_row, 0)
-    cell_name.text = str(group_name)
-    format_cell(cell_name, 12)
+    set_cell_text(table.cell(start_row, 0), str(group_name), 12)
     
-    for idx, (_, row) in enumerate(data.iterrows()):
+    # 数值列已是float64，按列取出后逐行按元组遍历，不为每行构造Series
+    rows = data[['Number', 'Thickness', 'MaxForce', 'Displacement', 'Angle']].itertuples(index=False, name=None)
+    for idx, (number, thick, force, disp, angle) in enumerate(rows):
         r = start_row + idx
-        format_cell_text(table, r, 1, str(row['Number']))
-        format_cell_text(table, r, 2, f"{to_float(row['Thickness']):.2f}")
+        # 无法转换为数字的值（NaN）在数据行中显示为0，统计行中则被剔除
+        thick, force, disp, angle = (0.0 if v != v else v for v in (thick, force, disp, angle))
+        format_cell_text(table, r, 1, str(number))
+        format_cell_text(table, r, 2, f"{thick:.2f}")
         
         # 注意：这里保留了单位转换逻辑
-        val_f = to_float(row['MaxForce'])
-        if unit == 'kN': val_f /= 1000.0
-        format_cell_text(table, r, 3, f"{val_f:.1f}")
+        if unit == 'kN': force /= 1000.0
+        format_cell_text(table, r, 3, f"{force:.1f}")
         
         current_col = 4
         if include_disp:
-            format_cell_text(table, r, current_col, f"{to_float(row['Displacement']):.2f}")
+            format_cell_text(table, r, current_col, f"{disp:.2f}")
             current_col += 1
         
         if current_col < len(table.columns):
-            format_cell_text(table, r, current_col, f"{to_float(row['Angle']):.2f}")
+            format_cell_text(table, r, current_col, f"{angle:.2f}")
 
 def fill_stats_row(table, data, r_idx, unit, include_disp):
-    c_lbl = table.cell(r_idx, 1)
-    c_lbl.text = "平均值±标准差"
-    format_cell(c_lbl, 12, bold=True)
+    set_cell_text(table.cell(r_idx, 1), "平均值±标准差", 12, bold=True)
     custom_color = (25, 137, 141)
     
     set_stat_cell(table.cell(r_idx, 2), data['Thickness'], 1, 1.0, custom_color)
     
     # 统计行单位转换
-    f_vals = pd.to_numeric(data['MaxForce'], errors='coerce')
-    if unit == 'kN': f_vals = f_vals / 1000.0
-    set_stat_cell(table.cell(r_idx, 3), f_vals, 1, 1.0, custom_color)
+    f_factor = 1 / 1000.0 if unit == 'kN' else 1.0
+    set_stat_cell(table.cell(r_idx, 3), data['MaxForce'], 1, f_factor, custom_color)
     
     current_col = 4
     if include_disp:
@@ -247,33 +279,36 @@ def fill_stats_row(table, data, r_idx, unit, include_disp):
 
 def format_cell_text(table, r, c, text):
     try:
-        cell = table.cell(r, c)
-        cell.text = text
-        format_cell(cell, 12)
+        set_cell_text(table.cell(r, c), text, 12)
     except: pass
 
 def set_stat_cell(cell, series, decimals=1, factor=1.0, color_rgb=None):
-    series = pd.to_numeric(series, errors='coerce').dropna() * factor
-    if len(series) == 0:
+    # 数值列已在读取后转换为float64，这里直接在数组上计算
+    arr = series.to_numpy(dtype=np.float64)
+    arr = arr[~np.isnan(arr)] * factor
+    if arr.size == 0:
         txt = "-"
     else:
-        mean = series.mean()
-        std = series.std(ddof=1) if len(series) > 1 else 0.0
-        txt = f"{mean:.{decimals}f}±{std:.{decimals}f}"
+        std = arr.std(ddof=1) if arr.size > 1 else 0.0
+        txt = f"{arr.mean():.{decimals}f}±{std:.{decimals}f}"
     
-    cell.text = txt
-    format_cell(cell, 12, bold=True, color=color_rgb)
+    set_cell_text(cell, txt, 12, bold=True, color=color_rgb)
 
-def format_cell(cell, size, bold=False, color=None):
-    if not cell.text_frame.paragraphs:
-        cell.text_frame.text = ""
-    p = cell.text_frame.paragraphs[0]
-    p.font.size = Pt(size)
-    p.font.name = '微软雅黑'
-    p.font.bold = bold
+def set_cell_text(cell, text, size, bold=False, color=None):
+    """直接生成单元格文本XML：一个居中段落、一个文本段，字号/字体/粗体/颜色一次写入"""
+    txBody = cell._tc.get_or_add_txBody()
+    for p in txBody.findall(qn('a:p')):
+        txBody.remove(p)
+    
+    p = etree.SubElement(txBody, qn('a:p'))
+    etree.SubElement(p, qn('a:pPr'), algn='ctr')
+    r = etree.SubElement(p, qn('a:r'))
+    rPr = etree.SubElement(r, qn('a:rPr'), sz=str(size * 100), b='1' if bold else '0')
     if color:
-        p.font.color.rgb = RGBColor(*color)
-    p.alignment = 2
+        solid_fill = etree.SubElement(rPr, qn('a:solidFill'))
+        etree.SubElement(solid_fill, qn('a:srgbClr'), val='%02X%02X%02X' % tuple(color))
+    etree.SubElement(rPr, qn('a:latin'), typeface='微软雅黑')
+    etree.SubElement(r, qn('a:t')).text = text
 
 def replace_text_in_slide(slide, old_txt, new_txt):
     for shape in slide.shapes:
@@ -282,9 +317,9 @@ def replace_text_in_slide(slide, old_txt, new_txt):
                 if old_txt in p.text:
                     p.text = p.text.replace(old_txt, new_txt)
 
-def add_table_row(table, clone_idx):
+def add_table_rows(table, clone_idx, n):
+    """在clone_idx行之后一次插入n个该行的副本（去掉合并信息），副本只清理一次"""
     import copy
-    from pptx.oxml.ns import qn
     tr = table.rows[clone_idx]._tr
     new_tr = copy.deepcopy(tr)
     for tc in new_tr.tc_lst:
@@ -293,4 +328,7 @@ def add_table_row(table, clone_idx):
                 elem = tc.tcPr.find(qn(tag))
                 if elem is not None:
                     tc.tcPr.remove(elem)
-    tr.addnext(new_tr)
+    new_trs = [new_tr] + [copy.deepcopy(new_tr) for _ in range(n - 1)]
+    parent = tr.getparent()
+    pos = parent.index(tr) + 1
+    parent[pos:pos] = new_trs